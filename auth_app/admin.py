@@ -4,6 +4,9 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+# Local imports
+from auth_app.models import EmailOutbox
+
 
 User = get_user_model()
 
@@ -33,3 +36,21 @@ class UserAdmin(BaseUserAdmin):
             "fields": ("email", "password1", "password2"),
         }),
     )
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    """Admin for queued transactional emails (context holds raw tokens)."""
+    list_display = ["to_email", "subject", "status", "attempts",
+                    "created_at", "sent_at", "latency"]
+    list_filter = ["status"]
+    search_fields = ["to_email", "subject"]
+    readonly_fields = ["created_at", "sent_at", "last_error"]
+    exclude = ["context"]
+
+    @admin.display(description=_("Latency (s)"))
+    def latency(self, obj):
+        """Return seconds between queueing and delivery."""
+        if not obj.sent_at:
+            return None
+        return round((obj.sent_at - obj.created_at).total_seconds(), 2)
@@ -1,12 +1,12 @@
 # Third-party suppliers
 from django.contrib.auth import authenticate, get_user_model
-from knox.auth import TokenAuthentication
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Local imports
+from auth_app.authentication import CachedTokenAuthentication
 from auth_app.api.serializers import (
     AccountActivationSerializer,
     AccountReactivationSerializer,
@@ -154,7 +154,7 @@ class LogoutView(APIView):
 
     Deletes the auth token to log the user out.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -192,7 +192,7 @@ class PasswordUpdateView(APIView):
 
     Updates the user´s password.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -217,7 +217,7 @@ class DeregistrationView(APIView):
 
     Reauthenticates a user and sends an account deletion email.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -242,7 +242,7 @@ class AccountDeletionView(APIView):
 
     Deletes a user´s account.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request):
@@ -0,0 +1,124 @@
+# Standard libraries
+import binascii
+
+# Third-party suppliers
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from knox.auth import TokenAuthentication
+from knox.crypto import hash_token
+from knox.models import AuthToken
+from knox.signals import token_expired
+from rest_framework import exceptions
+from rest_framework.authentication import get_authorization_header
+
+# Local imports
+from core.metrics import count_cache
+
+
+def token_cache_key(digest: str) -> str:
+    """Return the cache key of an authenticated token digest."""
+    return f"auth:token:{digest}"
+
+
+def token_cache_ttl() -> int:
+    """Return the seconds an authenticated token stays cached."""
+    return int(getattr(settings, "AUTH_TOKEN_CACHE_TTL", 60))
+
+
+def evict_token(digest: str) -> None:
+    """Drop a cached token so the next request re-reads the database."""
+    cache.delete(token_cache_key(digest))
+
+
+def evict_user_tokens(user_id: int) -> None:
+    """Drop all cached tokens of a user."""
+    digests = AuthToken.objects.filter(user_id=user_id).values_list(
+        "digest", flat=True)
+    cache.delete_many([token_cache_key(d) for d in digests])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Class representing a cached Knox token authentication.
+
+    Keeps digest -> token (with its user) in the cache for a short TTL so that
+    repeated requests skip the AuthToken and User queries.
+    """
+
+    def cache_key(self, token: bytes) -> str:
+        """Return the cache key of a raw token."""
+        try:
+            digest = hash_token(token.decode("utf-8"))
+        except (TypeError, UnicodeDecodeError, binascii.Error):
+            raise exceptions.AuthenticationFailed("Invalid token.")
+        return token_cache_key(digest)
+
+    def authenticate_credentials(self, token: bytes):
+        """Authenticate a raw token from the cache or via Knox."""
+        key = self.cache_key(token)
+        auth_token = cache.get(key)
+        count_cache("auth_token", auth_token is not None)
+        if auth_token is not None:
+            if not auth_token.expiry or auth_token.expiry > timezone.now():
+                return self.validate_user(auth_token)
+            cache.delete(key)
+        return self.authenticate_uncached(token, key)
+
+    def authenticate_uncached(self, token: bytes, key: str):
+        """Authenticate a raw token via Knox and cache it under key."""
+        user, auth_token = super().authenticate_credentials(token)
+        ttl = token_cache_ttl()
+        if auth_token.expiry:
+            left = (auth_token.expiry - timezone.now()).total_seconds()
+            ttl = min(ttl, int(left))
+        if ttl > 0:
+            cache.set(key, auth_token, timeout=ttl)
+        return user, auth_token
+
+    def _cleanup_token(self, auth_token) -> bool:
+        """Delete auth_token if expired; other tokens are left to the sweep.
+
+        Knox loads and checks every token of the user here on each miss.
+        """
+        if auth_token.expiry is None or auth_token.expiry >= timezone.now():
+            return False
+        username = auth_token.user.get_username()
+        auth_token.delete()
+        token_expired.send(sender=self.__class__, username=username,
+                           source="auth_token")
+        return True
+
+
+class AsyncCachedTokenAuthentication(CachedTokenAuthentication):
+    """
+    Class representing an async-aware cached Knox token authentication.
+
+    Cache hits are answered on the event loop; misses run the Knox
+    lookup in a worker thread.
+    """
+
+    def header_token(self, request) -> bytes | None:
+        """Return the raw token of the Authorization header, like Knox."""
+        auth = get_authorization_header(request).split()
+        prefix = self.authenticate_header(request).encode()
+        if not auth or auth[0].lower() != prefix.lower():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+        return auth[1]
+
+    async def aauthenticate(self, request):
+        """Return (user, token) of a request, or None without a token."""
+        token = self.header_token(request)
+        if token is None:
+            return None
+        key = self.cache_key(token)
+        auth_token = await cache.aget(key)
+        count_cache("auth_token", auth_token is not None)
+        if auth_token is not None:
+            if not auth_token.expiry or auth_token.expiry > timezone.now():
+                return self.validate_user(auth_token)
+            await cache.adelete(key)
+        return await sync_to_async(self.authenticate_uncached)(token, key)
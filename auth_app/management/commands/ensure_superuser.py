@@ -0,0 +1,38 @@
+# Standard libraries
+import os
+
+# Third-party suppliers
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+
+
+class Command(BaseCommand):
+    """
+    Class representing the ensure_superuser command.
+
+    Creates the superuser given by DJANGO_SUPERUSER_* environment
+    variables unless a user with that email exists, so it can run on
+    every deploy and on several replicas at once.
+    """
+    help = "Create the superuser from the environment if it is missing."
+
+    def handle(self, *args, **options):
+        """Create the superuser once."""
+        email = os.environ.get("DJANGO_SUPERUSER_EMAIL", "admin@example.com")
+        User = get_user_model()
+        if User.objects.filter(email=email).exists():
+            self.stdout.write(f"Superuser '{email}' already exists.")
+            return
+        try:
+            with transaction.atomic():
+                User.objects.create_superuser(
+                    email=email,
+                    password=os.environ.get("DJANGO_SUPERUSER_PASSWORD",
+                                            "adminpassword"),
+                    username=os.environ.get("DJANGO_SUPERUSER_USERNAME",
+                                            "admin"))
+        except IntegrityError:
+            self.stdout.write(f"Superuser '{email}' already exists.")
+            return
+        self.stdout.write(f"Superuser '{email}' created.")
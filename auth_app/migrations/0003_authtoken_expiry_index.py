@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_emailoutbox'),
+        ('knox', '0009_extend_authtoken_field'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS knox_authtoken_expiry_idx '
+                'ON knox_authtoken (expiry);',
+            reverse_sql='DROP INDEX IF EXISTS knox_authtoken_expiry_idx;',
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -57,3 +58,40 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         """Represent a user by email."""
         return self.email
+
+
+class EmailOutbox(models.Model):
+    """
+    Class representing a queued transactional email.
+
+    Views only store template, subject and context; a worker renders
+    and delivers pending messages in batches with retry backoff.
+    """
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (SENT, "Sent"),
+                      (FAILED, "Failed")]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=200)
+    template = models.CharField(max_length=200)
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES,
+                              default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"],
+                         name="outbox_status_due_idx"),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        """Represent a queued email by recipient, subject and status."""
+        return f"{self.to_email}: {self.subject} ({self.status})"
@@ -1,28 +1,32 @@
-# Standard libraries
-import logging
-
 # Third-party suppliers
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django_rq import enqueue
 from knox.models import AuthToken
 
 # Local imports
-from auth_app.tasks import delete_user_expired_knox_tokens
-
-
-logger = logging.getLogger(__name__)
+from auth_app.authentication import evict_token, evict_user_tokens
+from auth_app.tasks import schedule_token_sweep
 
 
 @receiver(post_save, sender=AuthToken)
-def enqueue_cleanup_on_token_create(sender, instance, created, **kwargs):
+def schedule_cleanup_on_token_create(sender, instance, created, **kwargs):
     """
-    Enqueue background cleanup for the same user's expired Knox tokens
-    whenever a new token is created.
+    Make sure an expired token sweep is scheduled whenever a new token
+    is created; bursts of logins share one sweep per interval.
     """
+    if created:
+        schedule_token_sweep()
+
+
+@receiver(post_delete, sender=AuthToken)
+def evict_deleted_token(sender, instance, **kwargs):
+    """Evict a deleted token (logout, password update, deletion)."""
+    evict_token(instance.digest)
+
+
+@receiver(post_save, sender=get_user_model())
+def evict_changed_user_tokens(sender, instance, created, **kwargs):
+    """Evict cached tokens so a changed user is re-read on next request."""
     if not created:
-        return
-    try:
-        enqueue(delete_user_expired_knox_tokens, instance.user_id)
-    except Exception:
-        logger.exception("Failed to enqueue token cleanup task.")
+        evict_user_tokens(instance.pk)
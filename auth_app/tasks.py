@@ -1,12 +1,232 @@
+# Standard libraries
+import logging
+from datetime import timedelta
+
 # Third-party suppliers
+import django_rq
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
 from django.utils import timezone
 from knox.models import AuthToken
 
+# Local imports
+from auth_app.models import EmailOutbox
+from core.metrics import record_email_delivery
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_LEASE = timedelta(minutes=5)
+MAX_BACKOFF_SECONDS = 3600
+SWEEP_SCHEDULED_KEY = "auth:token_sweep:scheduled"
+PURGE_SCHEDULED_KEY = "auth:outbox_purge:scheduled"
+
 
 def delete_user_expired_knox_tokens(user_id: int) -> int:
-    """Delete expired Knox tokens for a user and return deleted count."""
+    """Deprecated: run the expired token sweep for already queued jobs.
+
+    Kept so jobs enqueued under this path before the sweeper still
+    import; remove in a later release.
+    """
+    return sweep_expired_tokens()
+
+
+def sweep_interval() -> int:
+    """Return the seconds between expired token sweeps."""
+    return int(getattr(settings, "TOKEN_SWEEP_INTERVAL", 900))
+
+
+def sweep_expired_tokens(batch_size: int | None = None) -> int:
+    """Delete expired tokens in bounded batches and return the count."""
+    size = batch_size or int(getattr(settings, "TOKEN_SWEEP_BATCH_SIZE",
+                                     1000))
+    now, total = timezone.now(), 0
+    while True:
+        pks = list(AuthToken.objects.filter(expiry__lt=now)
+                   .order_by("expiry")
+                   .values_list("pk", flat=True)[:size])
+        if not pks:
+            break
+        total += AuthToken.objects.filter(pk__in=pks).delete()[0]
+        if len(pks) < size:
+            break
+    if total:
+        logger.info("Token sweep deleted %s expired tokens.", total)
+    return total
+
+
+def schedule_token_sweep() -> bool:
+    """Enqueue one delayed sweep per interval; later calls coalesce."""
+    interval = sweep_interval()
+    if not cache.add(SWEEP_SCHEDULED_KEY, 1, timeout=interval):
+        return False
+    try:
+        django_rq.get_queue("housekeeping").enqueue_in(
+            timedelta(seconds=interval), sweep_expired_tokens)
+    except Exception:
+        cache.delete(SWEEP_SCHEDULED_KEY)
+        logger.exception("Failed to schedule expired token sweep.")
+        return False
+    return True
+
+
+def outbox_setting(name: str, default: int) -> int:
+    """Return an integer EMAIL_OUTBOX_* setting."""
+    return int(getattr(settings, f"EMAIL_OUTBOX_{name}", default))
+
+
+def outbox_retention() -> int:
+    """Return the seconds sent emails are kept in the outbox."""
+    return outbox_setting("RETENTION_HOURS", 24) * 3600
+
+
+def retry_delay(attempts: int) -> int:
+    """Return the exponential backoff in seconds after a failed attempt."""
+    base = outbox_setting("BACKOFF_SECONDS", 30)
+    return min(base * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+
+
+def schedule_delivery(delay: int = 0) -> None:
+    """Enqueue an outbox delivery job, optionally delayed."""
+    try:
+        queue = django_rq.get_queue("media-light")
+        if delay:
+            queue.enqueue_in(timedelta(seconds=delay), deliver_outbox)
+        else:
+            queue.enqueue(deliver_outbox)
+    except Exception:
+        logger.exception("Failed to enqueue email outbox delivery.")
+
+
+def claim_batch(size: int) -> list[EmailOutbox]:
+    """Lease due pending emails so concurrent workers skip them."""
     now = timezone.now()
-    qs = AuthToken.objects.filter(user_id=user_id, expiry__lt=now)
-    count = qs.count()
-    qs.delete()
-    return count
+    with transaction.atomic():
+        rows = list(EmailOutbox.objects.select_for_update(skip_locked=True)
+                    .filter(status=EmailOutbox.PENDING,
+                            next_attempt_at__lte=now)
+                    .order_by("next_attempt_at")[:size])
+        EmailOutbox.objects.filter(pk__in=[r.pk for r in rows]).update(
+            attempts=F("attempts") + 1, next_attempt_at=now + OUTBOX_LEASE)
+    for row in rows:
+        row.attempts += 1
+    return rows
+
+
+def build_message(row: EmailOutbox, connection) -> EmailMultiAlternatives:
+    """Render a queued email into a single-recipient HTML message."""
+    html = render_to_string(row.template, row.context)
+    msg = EmailMultiAlternatives(row.subject, html, to=[row.to_email],
+                                 connection=connection)
+    msg.attach_alternative(html, "text/html")
+    return msg
+
+
+def mark_failed(row: EmailOutbox, exc: Exception) -> int:
+    """Record a failed attempt and return the retry delay (0 = given up)."""
+    delay = 0
+    if row.attempts >= outbox_setting("MAX_ATTEMPTS", 5):
+        row.status = EmailOutbox.FAILED
+        row.context = {}
+    else:
+        delay = retry_delay(row.attempts)
+        row.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    row.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+    row.save(update_fields=["status", "attempts", "next_attempt_at",
+                            "last_error", "context"])
+    return delay
+
+
+def reopen(connection) -> None:
+    """Replace a possibly broken connection after a failed send."""
+    connection.close()
+    try:
+        connection.open()
+    except Exception:
+        logger.exception("Failed to reopen the email connection.")
+
+
+def deliver_rows(rows: list[EmailOutbox]) -> int:
+    """Send rows over one reused connection and return the sent count."""
+    sent, delays = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning("Email connection failed: %s", exc)
+        delays = [mark_failed(row, exc) for row in rows]
+        rows = []
+    for row in rows:
+        try:
+            build_message(row, connection).send()
+        except Exception as exc:
+            logger.warning("Email %s to %s failed (attempt %s): %s",
+                           row.pk, row.to_email, row.attempts, exc)
+            delays.append(mark_failed(row, exc))
+            reopen(connection)
+        else:
+            sent.append(row)
+    connection.close()
+    now = timezone.now()
+    # The context holds links with raw tokens; keep it only until sent
+    EmailOutbox.objects.filter(pk__in=[r.pk for r in sent]).update(
+        status=EmailOutbox.SENT, sent_at=now, last_error="", context={})
+    log_delivery(sent, delays, now)
+    retries = [d for d in delays if d]
+    if retries:
+        schedule_delivery(min(retries))
+    if sent:
+        schedule_outbox_purge()
+    return len(sent)
+
+
+def log_delivery(sent: list[EmailOutbox], delays: list[int], now) -> None:
+    """Log and record the outcome and queue latency of a delivery batch."""
+    if not sent and not delays:
+        return
+    latencies = [(now - r.created_at).total_seconds() for r in sent]
+    retried = sum(1 for d in delays if d)
+    record_email_delivery(latencies, retried, len(delays) - retried)
+    latency = sum(latencies) / len(latencies) if latencies else 0.0
+    logger.info("Email outbox: %s sent, %s failed, latency %.2fs",
+                len(sent), len(delays), latency)
+
+
+def purge_sent_emails() -> int:
+    """Delete emails sent before the retention window; return the count."""
+    cutoff = timezone.now() - timedelta(seconds=outbox_retention())
+    deleted = EmailOutbox.objects.filter(status=EmailOutbox.SENT,
+                                         sent_at__lt=cutoff).delete()[0]
+    if deleted:
+        logger.info("Email outbox purge deleted %s sent emails.", deleted)
+    return deleted
+
+
+def schedule_outbox_purge() -> bool:
+    """Enqueue one delayed purge per retention period; calls coalesce."""
+    retention = outbox_retention()
+    if not cache.add(PURGE_SCHEDULED_KEY, 1, timeout=retention):
+        return False
+    try:
+        django_rq.get_queue("housekeeping").enqueue_in(
+            timedelta(seconds=retention), purge_sent_emails)
+    except Exception:
+        cache.delete(PURGE_SCHEDULED_KEY)
+        logger.exception("Failed to schedule email outbox purge.")
+        return False
+    return True
+
+
+def deliver_outbox(batch_size: int | None = None) -> int:
+    """Deliver due outbox emails in batches and return the sent count."""
+    size = batch_size or outbox_setting("BATCH_SIZE", 50)
+    total = 0
+    while rows := claim_batch(size):
+        total += deliver_rows(rows)
+        if len(rows) < size:
+            break
+    return total
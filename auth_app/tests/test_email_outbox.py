@@ -0,0 +1,166 @@
+# Standard libraries
+from datetime import timedelta
+from smtplib import SMTPException
+
+# Third-party suppliers
+import pytest
+from django.contrib.admin.sites import site
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+# Local imports
+from auth_app import tasks
+from auth_app.models import EmailOutbox
+from auth_app.tests.utils.factories import make_user
+from auth_app.utils import send_reset_email
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def async_outbox(settings):
+    """Leave queued emails to the delivery job."""
+    settings.EMAIL_OUTBOX_ASYNC = True
+
+
+@pytest.fixture
+def scheduled(monkeypatch) -> list[int]:
+    """Record scheduled delivery jobs instead of enqueuing them."""
+    delays: list[int] = []
+    monkeypatch.setattr(tasks, "schedule_delivery", delays.append)
+    return delays
+
+
+@pytest.fixture
+def smtp_down(monkeypatch):
+    """Make every send fail like an unreachable SMTP server."""
+    def fail(self, *args, **kwargs):
+        raise SMTPException("Connection unexpectedly closed")
+    monkeypatch.setattr(EmailMultiAlternatives, "send", fail)
+
+
+def _deliveries(result: str) -> float:
+    """Get the current email delivery counter for a result."""
+    return REGISTRY.get_sample_value("email_outbox_deliveries_total",
+                                     {"result": result}) or 0.0
+
+
+def test_view_queues_email_without_sending():
+    """Test for the request only storing the email."""
+    make_user(email="john.doe@mail.com", is_active=True)
+    res = APIClient().post(reverse("auth_app:password_reset"),
+                           {"email": "john.doe@mail.com"}, format="json")
+    assert res.status_code == 200
+    assert len(mail.outbox) == 0
+    row = EmailOutbox.objects.get()
+    assert row.status == EmailOutbox.PENDING
+    assert row.context["link"].count("reset-password") == 1
+
+
+def test_deliver_outbox_sends_batch_over_one_connection(monkeypatch):
+    """Test for rendering and sending a batch with a reused connection."""
+    opened = []
+    real = tasks.get_connection
+    monkeypatch.setattr(tasks, "get_connection",
+                        lambda: opened.append(1) or real())
+    for i in range(3):
+        send_reset_email(f"user{i}@mail.com", f"http://x/reset-password/{i}")
+    assert tasks.deliver_outbox() == 3
+    assert len(opened) == 1
+    assert len(mail.outbox) == 3
+    assert "reset-password" in mail.outbox[0].alternatives[0][0]
+    assert not EmailOutbox.objects.exclude(status=EmailOutbox.SENT).exists()
+    assert EmailOutbox.objects.filter(sent_at__isnull=True).count() == 0
+
+
+def test_failed_delivery_backs_off(smtp_down, scheduled):
+    """Test for failed sends being retried later with backoff."""
+    send_reset_email("john.doe@mail.com", "http://x/reset-password/1")
+    assert tasks.deliver_outbox() == 0
+    row = EmailOutbox.objects.get()
+    assert row.status == EmailOutbox.PENDING and row.attempts == 1
+    assert row.next_attempt_at > timezone.now()
+    assert "SMTPException" in row.last_error
+    assert scheduled == [30]
+    assert tasks.deliver_outbox() == 0
+    assert EmailOutbox.objects.get().attempts == 1
+
+
+def test_retry_delay_grows_exponentially():
+    """Test for doubling retry delays up to the cap."""
+    assert [tasks.retry_delay(n) for n in (1, 2, 3)] == [30, 60, 120]
+    assert tasks.retry_delay(20) == tasks.MAX_BACKOFF_SECONDS
+
+
+def test_delivery_gives_up_after_max_attempts(settings, smtp_down,
+                                              scheduled):
+    """Test for marking an email failed after the last attempt."""
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+    send_reset_email("john.doe@mail.com", "http://x/reset-password/1")
+    tasks.deliver_outbox()
+    assert EmailOutbox.objects.get().status == EmailOutbox.FAILED
+    assert scheduled == []
+
+
+def test_sent_email_drops_context_and_records_metrics(monkeypatch):
+    """Test for token links being cleared once sent, with metrics."""
+    monkeypatch.setattr(tasks, "schedule_outbox_purge", lambda: True)
+    latency = REGISTRY.get_sample_value("email_outbox_latency_seconds_count")
+    sent = _deliveries("sent")
+    send_reset_email("john.doe@mail.com", "http://x/reset-password/1")
+    tasks.deliver_outbox()
+    assert EmailOutbox.objects.get().context == {}
+    assert _deliveries("sent") == sent + 1
+    assert REGISTRY.get_sample_value(
+        "email_outbox_latency_seconds_count") == latency + 1
+
+
+def test_given_up_email_drops_context(settings, smtp_down, scheduled):
+    """Test for failed emails counted and not keeping their token links."""
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+    failed = _deliveries("failed")
+    send_reset_email("john.doe@mail.com", "http://x/reset-password/1")
+    tasks.deliver_outbox()
+    assert EmailOutbox.objects.get().context == {}
+    assert _deliveries("failed") == failed + 1
+
+
+def test_purge_deletes_sent_emails_past_retention(settings):
+    """Test for purging only sent emails older than the retention."""
+    settings.EMAIL_OUTBOX_RETENTION_HOURS = 1
+    old = timezone.now() - timedelta(hours=2)
+    for status, sent_at in [(EmailOutbox.SENT, old),
+                            (EmailOutbox.SENT, timezone.now()),
+                            (EmailOutbox.PENDING, None)]:
+        EmailOutbox.objects.create(to_email="a@mail.com", subject="s",
+                                   template="t", status=status,
+                                   sent_at=sent_at)
+    assert tasks.purge_sent_emails() == 1
+    assert EmailOutbox.objects.count() == 2
+
+
+def test_outbox_purge_is_scheduled_once(monkeypatch):
+    """Test for coalescing purge jobs within the retention window."""
+    enqueued = []
+
+    class Queue:
+        def enqueue_in(self, delay, func):
+            """Record a delayed job."""
+            enqueued.append((delay, func))
+
+    monkeypatch.setattr(tasks.django_rq, "get_queue", lambda name: Queue())
+    assert tasks.schedule_outbox_purge() is True
+    assert tasks.schedule_outbox_purge() is False
+    assert enqueued == [(timedelta(hours=24), tasks.purge_sent_emails)]
+
+
+def test_admin_hides_email_context(rf):
+    """Test for the admin form not exposing the stored token links."""
+    admin = site._registry[EmailOutbox]
+    request = rf.get("/")
+    assert "context" not in admin.get_form(request).base_fields
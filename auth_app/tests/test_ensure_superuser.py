@@ -0,0 +1,27 @@
+# Standard libraries
+from io import StringIO
+
+# Third-party suppliers
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _run() -> str:
+    """Run ensure_superuser and return its output."""
+    out = StringIO()
+    call_command("ensure_superuser", stdout=out)
+    return out.getvalue()
+
+
+def test_superuser_is_created_once(monkeypatch):
+    """Test for creating the superuser on the first run only."""
+    monkeypatch.setenv("DJANGO_SUPERUSER_EMAIL", "root@mail.com")
+    monkeypatch.setenv("DJANGO_SUPERUSER_PASSWORD", "Secret123!")
+    assert "created" in _run()
+    assert "already exists" in _run()
+    user = get_user_model().objects.get(email="root@mail.com")
+    assert user.is_superuser and user.check_password("Secret123!")
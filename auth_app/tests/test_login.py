@@ -47,3 +47,14 @@ def test_login_failed_authentication(payload):
     res = APIClient().post(url, payload, format="json")
     assert res.status_code == 400
     assert res.json() == BAD
+
+
+def test_login_query_budget(query_budget):
+    """Test for the query count of a login."""
+    make_user(email="john.doe@mail.com", password="Test123!",
+              is_active=True)
+    payload = {"email": "john.doe@mail.com", "password": "Test123!"}
+    with query_budget(2):
+        res = APIClient().post(reverse("auth_app:login"), payload,
+                               format="json")
+    assert res.status_code == 200
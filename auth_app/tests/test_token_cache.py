@@ -0,0 +1,73 @@
+# Third-party suppliers
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+# Local imports
+from auth_app.tests.utils.factories import make_user
+from auth_app.utils import create_knox_token
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _auth_client(token: str) -> APIClient:
+    """Get APIClient authenticated by a token."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    return client
+
+
+def _check(client: APIClient):
+    """Post a token check."""
+    return client.post(reverse("token_app:token_check"), {}, format="json")
+
+
+def _login_user(email: str = "john.doe@mail.com"):
+    """Create an active user with a token and an authenticated client."""
+    user = make_user(email=email, password="OldPass1!", is_active=True)
+    return user, _auth_client(create_knox_token(user, hours=1))
+
+
+def test_cached_token_skips_database(django_assert_num_queries):
+    """Test for a repeated request authenticating without queries."""
+    _, client = _login_user()
+    assert _check(client).status_code == 200
+    with django_assert_num_queries(0):
+        assert _check(client).status_code == 200
+
+
+def test_logout_evicts_cached_token():
+    """Test for a logged out token being rejected immediately."""
+    _, client = _login_user()
+    assert _check(client).status_code == 200
+    client.post(reverse("auth_app:logout"), {}, format="json")
+    assert _check(client).status_code == 401
+
+
+def test_password_update_evicts_cached_token():
+    """Test for the token being rejected right after a password update."""
+    user, client = _login_user()
+    assert _check(client).status_code == 200
+    payload = {"email": user.email, "password": "NewPass1!",
+               "repeated_password": "NewPass1!"}
+    client.post(reverse("auth_app:password_update"), payload, format="json")
+    assert _check(client).status_code == 401
+
+
+def test_account_deletion_evicts_cached_tokens():
+    """Test for all tokens of a deleted account being rejected."""
+    user, client = _login_user()
+    other = _auth_client(create_knox_token(user, hours=1))
+    assert _check(other).status_code == 200
+    client.delete(reverse("auth_app:account_deletion"))
+    assert _check(other).status_code == 401
+
+
+def test_deactivated_user_is_rejected():
+    """Test for a changed user being re-read instead of served stale."""
+    user, client = _login_user()
+    assert _check(client).status_code == 200
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+    assert _check(client).status_code == 401
@@ -0,0 +1,68 @@
+# Standard libraries
+from datetime import timedelta
+
+# Third-party suppliers
+import pytest
+from knox.models import AuthToken
+
+# Local imports
+from auth_app import tasks
+from auth_app.tests.utils.factories import make_user
+from auth_app.utils import create_knox_token
+
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeQueue:
+    """Queue stub recording delayed jobs."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue_in(self, delay, func, *args):
+        """Record a delayed job."""
+        self.jobs.append((delay, func))
+
+
+@pytest.fixture
+def queue(monkeypatch) -> FakeQueue:
+    """Replace the RQ queue used for scheduling sweeps."""
+    fake = FakeQueue()
+    monkeypatch.setattr(tasks.django_rq, "get_queue", lambda name: fake)
+    return fake
+
+
+def _expire(count: int, user):
+    """Create count tokens of user that are already expired."""
+    for _ in range(count):
+        create_knox_token(user, hours=-1)
+
+
+def test_sweep_deletes_expired_tokens_in_batches(queue):
+    """Test for deleting all expired tokens across several batches."""
+    user = make_user(email="john.doe@mail.com", is_active=True)
+    _expire(5, user)
+    create_knox_token(user, hours=1)
+    assert tasks.sweep_expired_tokens(batch_size=2) == 5
+    assert AuthToken.objects.count() == 1
+
+
+def test_login_burst_schedules_one_sweep(queue):
+    """Test for coalescing sweep requests of many new tokens."""
+    user = make_user(email="john.doe@mail.com", is_active=True)
+    for _ in range(3):
+        create_knox_token(user, hours=1)
+    assert len(queue.jobs) == 1
+    delay, func = queue.jobs[0]
+    assert func is tasks.sweep_expired_tokens
+    assert delay == timedelta(seconds=tasks.sweep_interval())
+
+
+def test_deprecated_per_user_cleanup_runs_the_sweep(queue):
+    """Test for already queued per-user jobs still running as a sweep."""
+    user = make_user(email="john.doe@mail.com", is_active=True)
+    _expire(2, user)
+    create_knox_token(user, hours=1)
+    assert tasks.delete_user_expired_knox_tokens(user.id) == 2
+    assert AuthToken.objects.filter(user=user).count() == 1
@@ -5,13 +5,16 @@ from datetime import timedelta
 # Third-party suppliers
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.utils import timezone
 from knox.crypto import hash_token
 from knox.models import AuthToken
 from rest_framework import serializers
 
+# Local imports
+from auth_app.models import EmailOutbox
+from auth_app.tasks import deliver_rows, schedule_delivery
+
 EMAIL_RE = re.compile(
     r"^[A-ZÀ-Ÿa-zà-ÿß0-9._%+-]+@[A-ZÀ-Ÿa-zà-ÿß0-9.-]+\.[A-ZÀ-Ÿa-zà-ÿß]{2,}$"
 )
@@ -135,36 +138,43 @@ def build_deletion_link(token: str) -> str:
     return build_frontend_link(f"delete-account/{token}")
 
 
-def _send_html_email(subject: str, html: str, to_email: str) -> None:
-    """Send a single-recipient HTML email."""
-    msg = EmailMultiAlternatives(subject, html, to=[to_email])
-    msg.attach_alternative(html, "text/html")
-    msg.send()
+def outbox_async() -> bool:
+    """Check whether queued emails are delivered by the RQ worker."""
+    return bool(getattr(settings, "EMAIL_OUTBOX_ASYNC", True))
+
+
+def queue_email(template: str, subject: str, to_email: str,
+                context: dict) -> EmailOutbox:
+    """Store an email in the outbox and trigger its delivery."""
+    inline = not outbox_async()
+    row = EmailOutbox.objects.create(template=template, subject=subject,
+                                     to_email=to_email, context=context,
+                                     attempts=int(inline))
+    if inline:
+        deliver_rows([row])
+    else:
+        transaction.on_commit(schedule_delivery)
+    return row
 
 
 def send_activation_email(user, link: str) -> None:
-    """Send account activation email."""
-    html = render_to_string(
-        "auth_app/account-activation-email.html",
-        {"first_name": getattr(user, "first_name", ""), "link": link},
-    )
-    _send_html_email("Activate your account", html, user.email)
+    """Queue account activation email."""
+    queue_email("auth_app/account-activation-email.html",
+                "Activate your account", user.email,
+                {"first_name": getattr(user, "first_name", ""), "link": link})
 
 
 def send_reset_email(email: str, link: str) -> None:
-    """Send password reset email."""
-    html = render_to_string(
-        "auth_app/password-reset-email.html", {"link": link})
-    _send_html_email("Reset your password", html, email)
+    """Queue password reset email."""
+    queue_email("auth_app/password-reset-email.html",
+                "Reset your password", email, {"link": link})
 
 
 def send_deletion_email(user, link: str) -> None:
-    """Send account deletion confirmation email."""
-    html = render_to_string(
-        "auth_app/account-deletion-email.html",
-        {"first_name": getattr(user, "first_name", ""), "link": link},
-    )
-    _send_html_email("Confirm account deletion", html, user.email)
+    """Queue account deletion confirmation email."""
+    queue_email("auth_app/account-deletion-email.html",
+                "Confirm account deletion", user.email,
+                {"first_name": getattr(user, "first_name", ""), "link": link})
 
 
 def reauthenticate(request, email: str, password: str):
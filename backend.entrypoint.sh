@@ -2,42 +2,70 @@
 
 set -e
 
-echo "Warte auf PostgreSQL auf $DB_HOST:$DB_PORT..."
-
-# -q für "quiet" (keine Ausgabe außer Fehlern)
-# Die Schleife läuft, solange pg_isready *nicht* erfolgreich ist (Exit-Code != 0)
-while ! pg_isready -h "$DB_HOST" -p "$DB_PORT" -q; do
-  echo "PostgreSQL ist nicht erreichbar - schlafe 1 Sekunde"
-  sleep 1
-done
-
-echo "PostgreSQL ist bereit - fahre fort..."
-
-# Deine originalen Befehle (ohne wait_for_db)
-python manage.py collectstatic --noinput
-python manage.py makemigrations
-python manage.py migrate
-
-# Create a superuser using environment variables
-# (Dein Superuser-Erstellungs-Code bleibt gleich)
-python manage.py shell <<EOF
-import os
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-username = os.environ.get('DJANGO_SUPERUSER_USERNAME', 'admin')
-email = os.environ.get('DJANGO_SUPERUSER_EMAIL', 'admin@example.com')
-password = os.environ.get('DJANGO_SUPERUSER_PASSWORD', 'adminpassword')
-
-if not User.objects.filter(username=username).exists():
-    print(f"Creating superuser '{username}'...")
-    # Korrekter Aufruf: username hier übergeben
-    User.objects.create_superuser(username=username, email=email, password=password)
-    print(f"Superuser '{username}' created.")
-else:
-    print(f"Superuser '{username}' already exists.")
-EOF
-
-python manage.py rqworker default &
+# full: wait for PostgreSQL, collect static files, migrate, ensure the
+# superuser, then serve (local stacks with the source bind-mounted)
+# release: migrate and ensure the superuser, then exit (one-off deploy job)
+# fast: serve right away; static files and the migration check are baked
+# into the image and /ready/ reports when the replica can take traffic
+STARTUP_MODE="${STARTUP_MODE:-full}"
+
+wait_for_db() {
+  echo "Warte auf PostgreSQL auf $DB_HOST:$DB_PORT..."
+  # -q für "quiet" (keine Ausgabe außer Fehlern)
+  while ! pg_isready -h "$DB_HOST" -p "$DB_PORT" -q; do
+    echo "PostgreSQL ist nicht erreichbar - schlafe 1 Sekunde"
+    sleep 1
+  done
+  echo "PostgreSQL ist bereit - fahre fort..."
+}
+
+case "$STARTUP_MODE" in
+  full)
+    wait_for_db
+    python manage.py collectstatic --noinput
+    python manage.py migrate --noinput
+    python manage.py ensure_superuser
+    ;;
+  release)
+    wait_for_db
+    python manage.py migrate --noinput
+    python manage.py ensure_superuser
+    exit 0
+    ;;
+  fast)
+    ;;
+  *)
+    echo "Unknown STARTUP_MODE '$STARTUP_MODE' (full, release, fast)" >&2
+    exit 1
+    ;;
+esac
+
+# Metrics of gunicorn and RQ processes are aggregated in one directory
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Start $1 workers for the remaining queue arguments (in priority order)
+start_workers() {
+  count=$1
+  shift
+  i=0
+  while [ "$i" -lt "$count" ]; do
+    python manage.py rqworker "$@" --with-scheduler &
+    i=$((i + 1))
+  done
+}
+
+start_workers "${RQ_TRANSCODE_WORKERS:-1}" transcode
+start_workers "${RQ_LIGHT_WORKERS:-1}" media-light housekeeping default
+start_workers "${RQ_HOUSEKEEPING_WORKERS:-0}" housekeeping default
+
+# ASYNC_VIEWS serves the async read endpoints through uvicorn workers
+case "$(echo "${ASYNC_VIEWS:-False}" | tr '[:upper:]' '[:lower:]')" in
+  true|1|yes)
+    exec gunicorn core.asgi:application -k uvicorn_worker.UvicornWorker \
+      --bind 0.0.0.0:8000
+    ;;
+esac
 
 exec gunicorn core.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
@@ -0,0 +1,35 @@
+# Standard libraries
+from contextlib import contextmanager
+
+# Third-party suppliers
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def inline_email_outbox(settings):
+    """Deliver queued emails within the request unless a test opts out."""
+    settings.EMAIL_OUTBOX_ASYNC = False
+
+
+@pytest.fixture
+def query_budget(db):
+    """Return a context manager failing if its block exceeds a query count."""
+    @contextmanager
+    def budget(limit: int):
+        with CaptureQueriesContext(connection) as ctx:
+            yield ctx
+        sql = "\n".join(q["sql"] for q in ctx.captured_queries)
+        assert len(ctx) <= limit, (
+            f"{len(ctx)} queries, budget {limit}:\n{sql}")
+    return budget
@@ -0,0 +1,48 @@
+# Third-party suppliers
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+
+# Local imports
+from auth_app.authentication import AsyncCachedTokenAuthentication
+
+
+def json_response(data, status: int = 200) -> JsonResponse:
+    """Return JSON encoded like DRF's JSONRenderer (compact, UTF-8)."""
+    return JsonResponse(data, status=status, safe=False,
+                        json_dumps_params={"ensure_ascii": False,
+                                           "separators": (",", ":")})
+
+
+class AsyncAPIView(View):
+    """
+    Class representing an async, token authenticated JSON view.
+
+    Counterpart of an APIView with IsAuthenticated for ASGI servers:
+    handlers are coroutines and errors use the DRF response bodies.
+    """
+    authentication = AsyncCachedTokenAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Return the view without CSRF checks, like APIView."""
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def unauthorized(self, request, detail) -> JsonResponse:
+        """Return a 401 response asking for a token."""
+        res = json_response({"detail": str(detail)}, status=401)
+        res["WWW-Authenticate"] = self.authentication.authenticate_header(
+            request)
+        return res
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Authenticate the request, then run the async handler."""
+        try:
+            credentials = await self.authentication.aauthenticate(request)
+        except AuthenticationFailed as exc:
+            return self.unauthorized(request, exc.detail)
+        if credentials is None:
+            return self.unauthorized(request, NotAuthenticated.default_detail)
+        request.user, request.auth = credentials
+        return await super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,59 @@
+# Standard libraries
+import logging
+
+# Third-party suppliers
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+
+
+logger = logging.getLogger(__name__)
+
+_migrated = False
+
+
+def check_database() -> None:
+    """Run a trivial query on the default database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def check_cache() -> None:
+    """Read a key from the cache so an unreachable Redis raises."""
+    cache.get("ready:probe")
+
+
+def check_migrations() -> None:
+    """Raise while migrations are unapplied; remember success."""
+    global _migrated
+    if _migrated:
+        return
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        raise DatabaseError(f"{len(plan)} unapplied migrations.")
+    _migrated = True
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "migrations": check_migrations,
+}
+
+
+def ready_view(request):
+    """Report whether this replica can serve requests (200) or not (503)."""
+    results = {}
+    for name, check in CHECKS.items():
+        try:
+            check()
+            results[name] = "ok"
+        except Exception as exc:
+            logger.warning("Readiness check %s failed: %s", name, exc)
+            results[name] = "failed"
+    ready = all(result == "ok" for result in results.values())
+    return JsonResponse(
+        {"status": "ready" if ready else "unavailable", "checks": results},
+        status=200 if ready else 503)
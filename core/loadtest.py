@@ -0,0 +1,181 @@
+# Standard libraries
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party suppliers
+from django.contrib.auth import get_user_model
+
+# Local imports
+from auth_app.tests.utils.factories import make_user
+from video_app.models import Video
+from video_app.tests.utils.factories import make_video
+
+
+USER_EMAIL = "loadtest-{}@videoflix.local"
+USER_PASSWORD = "Loadtest123!"
+VIDEO_TITLE = "Loadtest {}"
+GENRES = ["Drama", "Nature", "Sci-Fi", "Comedy", "Documentary"]
+
+
+def seed(users: int, videos: int) -> tuple[list[str], list[int]]:
+    """Create missing load test users and videos; return emails and ids."""
+    emails = [USER_EMAIL.format(i) for i in range(users)]
+    existing = set(get_user_model().objects.filter(email__in=emails)
+                   .values_list("email", flat=True))
+    for email in set(emails) - existing:
+        make_user(email=email, password=USER_PASSWORD, is_active=True)
+    ids = []
+    for i in range(videos):
+        title = VIDEO_TITLE.format(i)
+        video = (Video.objects.filter(title=title).first()
+                 or make_video(title=title, genre=GENRES[i % len(GENRES)],
+                               duration=600.0))
+        ids.append(video.id)
+    return emails, ids
+
+
+def remove_seed() -> None:
+    """Delete the load test users (with their tokens/progress) and videos."""
+    get_user_model().objects.filter(
+        email__startswith="loadtest-").delete()
+    Video.objects.filter(title__startswith="Loadtest ").delete()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+    return values[rank]
+
+
+class Recorder:
+    """
+    Class representing a thread-safe latency recorder.
+
+    Collects latencies and error counts per endpoint name.
+    """
+
+    def __init__(self):
+        """Start with no samples."""
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, seconds: float, ok: bool) -> None:
+        """Record one request."""
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        """Return count, errors, throughput and percentiles per endpoint."""
+        report = {}
+        for name, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            report[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+                **{f"p{pct}_ms": round(percentile(values, pct) * 1000, 1)
+                   for pct in (50, 95, 99)},
+            }
+        return report
+
+
+class ApiSession:
+    """
+    Class representing one virtual user of the API.
+
+    Sends JSON requests with the user's token and records their latency.
+    """
+
+    def __init__(self, base_url: str, recorder: Recorder):
+        """Bind the session to a stack and a recorder."""
+        self.base_url, self.recorder = base_url.rstrip("/"), recorder
+        self.token = ""
+
+    def call(self, name: str, method: str, path: str,
+             body: dict | None = None) -> dict | list | None:
+        """Send a request and return its JSON body, None on errors."""
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data,
+                                     method=method)
+        req.add_header("Content-Type", "application/json")
+        if self.token:
+            req.add_header("Authorization", f"Token {self.token}")
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as res:
+                payload = res.read()
+            ok = True
+        except (urllib.error.URLError, OSError):
+            payload, ok = b"", False
+        self.recorder.add(name, time.perf_counter() - start, ok)
+        return json.loads(payload) if ok and payload else None
+
+    def login(self, email: str) -> bool:
+        """Log in and keep the token."""
+        out = self.call("login", "POST", "/api/login/",
+                        {"email": email, "password": USER_PASSWORD})
+        self.token = (out or {}).get("token", "")
+        return bool(self.token)
+
+
+def watch_session(session: ApiSession, video_ids: list[int],
+                  heartbeats: int, rng: random.Random) -> None:
+    """Replay one viewing: list, detail, progress and its heartbeats."""
+    session.call("video-list", "GET", "/api/videos/")
+    video_id = rng.choice(video_ids)
+    session.call("video-detail", "GET", f"/api/videos/{video_id}/")
+    position = rng.uniform(0, 60)
+    progress = session.call("video-progress-create", "POST",
+                            "/api/video-progress/",
+                            {"video_id": video_id, "last_position": position})
+    if not progress:
+        return
+    for _ in range(heartbeats):
+        position += 10
+        session.call("video-progress-detail", "PATCH",
+                     f"/api/video-progress/{progress['id']}/",
+                     {"last_position": position})
+
+
+def run_load(base_url: str, emails: list[str], video_ids: list[int],
+             concurrency: int, duration: float, heartbeats: int,
+             seed_value: int = 0, sessions: int = 0) -> dict:
+    """Run virtual users and return the report.
+
+    Each user watches for duration seconds from its login on, or for
+    at most sessions viewings if sessions is set.
+    """
+    recorder = Recorder()
+
+    def virtual_user(index: int) -> None:
+        rng = random.Random(seed_value + index)
+        session = ApiSession(base_url, recorder)
+        if not session.login(emails[index % len(emails)]):
+            return
+        deadline, watched = time.monotonic() + duration, 0
+        while time.monotonic() < deadline and not (
+                sessions and watched >= sessions):
+            watch_session(session, video_ids, heartbeats, rng)
+            watched += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(virtual_user, range(concurrency)))
+    elapsed = time.perf_counter() - start
+    endpoints = recorder.summary(elapsed)
+    total = sum(e["requests"] for e in endpoints.values())
+    return {"elapsed_s": round(elapsed, 2), "concurrency": concurrency,
+            "requests": total, "rps": round(total / elapsed, 1),
+            "endpoints": endpoints}
@@ -0,0 +1,254 @@
+# Standard libraries
+import os
+import time
+from contextlib import asynccontextmanager
+
+# Third-party suppliers
+import django_rq
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+STAGE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+EMAIL_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 900, 1800, 3600, 7200)
+POOL_STATS = ("pool_min", "pool_max", "pool_size", "pool_available",
+              "requests_waiting", "requests_num", "requests_queued",
+              "requests_wait_ms", "connections_num", "connections_lost")
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by URL name.",
+    ["view", "method", "status"])
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request.",
+    ["view"], buckets=QUERY_BUCKETS)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Database time per request.", ["view"])
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by cache and result.",
+    ["cache", "result"])
+DB_CONNECTIONS = Counter(
+    "db_connections_opened_total", "Database connections opened unpooled.",
+    ["alias"])
+DB_POOL = Gauge(
+    "db_pool", "Connection pool statistics summed over live workers.",
+    ["alias", "stat"], multiprocess_mode="livesum")
+EMAIL_DELIVERIES = Counter(
+    "email_outbox_deliveries_total", "Outbox send attempts by result.",
+    ["result"])
+EMAIL_LATENCY_SECONDS = Histogram(
+    "email_outbox_latency_seconds", "Seconds from queueing to delivery.",
+    buckets=EMAIL_BUCKETS)
+STAGE_SECONDS = Histogram(
+    "video_process_stage_seconds", "Duration of process_video stages.",
+    ["stage"], buckets=STAGE_BUCKETS)
+
+
+def multiprocess_dir() -> str:
+    """Return the directory shared by all processes, if configured."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+
+
+def count_cache(name: str, hit: bool) -> None:
+    """Record a hit or miss of a named cache."""
+    CACHE_LOOKUPS.labels(name, "hit" if hit else "miss").inc()
+
+
+def count_connection(sender, connection, **kwargs) -> None:
+    """Count a newly opened connection unless it came from a pool."""
+    if getattr(connection, "pool", None) is None:
+        DB_CONNECTIONS.labels(connection.alias).inc()
+
+
+connection_created.connect(count_connection,
+                           dispatch_uid="metrics_count_connection")
+
+
+def record_pool_stats() -> None:
+    """Publish the statistics of this process' connection pools."""
+    for conn in connections.all(initialized_only=True):
+        pool = getattr(conn, "pool", None)
+        if pool is None:
+            continue
+        stats = pool.get_stats()
+        for stat in POOL_STATS:
+            DB_POOL.labels(conn.alias, stat).set(stats.get(stat, 0))
+
+
+def record_email_delivery(latencies: list[float], retried: int,
+                          failed: int) -> None:
+    """Record sent emails with their queue latency, retries and failures."""
+    for latency in latencies:
+        EMAIL_LATENCY_SECONDS.observe(latency)
+    EMAIL_DELIVERIES.labels("sent").inc(len(latencies))
+    EMAIL_DELIVERIES.labels("retry").inc(retried)
+    EMAIL_DELIVERIES.labels("failed").inc(failed)
+
+
+def stage_timer(stage: str):
+    """Return a context manager timing a process_video stage."""
+    return STAGE_SECONDS.labels(stage).time()
+
+
+class QueryTracker:
+    """
+    Class representing a per-request database query tracker.
+
+    Installed as an execute wrapper, it counts queries and sums their time.
+    """
+
+    def __init__(self):
+        """Start with no queries."""
+        self.count, self.seconds = 0, 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run a query and record its duration."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+@asynccontextmanager
+async def async_execute_wrapper(wrapper):
+    """Install an execute wrapper for the queries of an async request.
+
+    Connections are per thread and the async ORM runs in the request's
+    thread-sensitive worker, so the wrapper is installed there.
+    """
+    def install():
+        connection.execute_wrappers.append(wrapper)
+
+    def uninstall():
+        connection.execute_wrappers.remove(wrapper)
+
+    await sync_to_async(install)()
+    try:
+        yield
+    finally:
+        await sync_to_async(uninstall)()
+
+
+class MetricsMiddleware:
+    """
+    Class representing the request metrics middleware.
+
+    Records latency, query count and query time of every request,
+    labelled with the resolved URL name. Runs under WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle a request and record its metrics."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tracker, start = QueryTracker(), time.perf_counter()
+        with connection.execute_wrapper(tracker):
+            response = self.get_response(request)
+        return self.record(request, response, tracker, start)
+
+    async def __acall__(self, request):
+        """Handle an async request and record its metrics."""
+        tracker, start = QueryTracker(), time.perf_counter()
+        async with async_execute_wrapper(tracker):
+            response = await self.get_response(request)
+        return self.record(request, response, tracker, start)
+
+    def record(self, request, response, tracker: QueryTracker,
+               start: float):
+        """Observe the metrics of a finished request."""
+        elapsed = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or "unnamed") if match else "unresolved"
+        REQUEST_SECONDS.labels(view, request.method,
+                               response.status_code).observe(elapsed)
+        REQUEST_QUERIES.labels(view).observe(tracker.count)
+        REQUEST_DB_SECONDS.labels(view).observe(tracker.seconds)
+        record_pool_stats()
+        return response
+
+
+class QueueCollector:
+    """
+    Class representing the RQ queue collector.
+
+    Reads queue depth and job registry sizes from Redis at scrape time,
+    so the values are the same whichever process serves the scrape.
+    """
+
+    def describe(self):
+        """Yield the metric without samples, so registering skips Redis."""
+        yield self.family()
+
+    def family(self) -> GaugeMetricFamily:
+        """Return an empty rq_jobs gauge."""
+        return GaugeMetricFamily("rq_jobs", "RQ jobs by queue and state.",
+                                 labels=["queue", "state"])
+
+    def collect(self):
+        """Yield the job counts per queue and state."""
+        jobs = self.family()
+        for name in getattr(settings, "RQ_QUEUES", {}):
+            queue = django_rq.get_queue(name)
+            jobs.add_metric([name, "queued"], queue.count)
+            jobs.add_metric([name, "started"],
+                            queue.started_job_registry.count)
+            jobs.add_metric([name, "scheduled"],
+                            queue.scheduled_job_registry.count)
+            jobs.add_metric([name, "failed"],
+                            queue.failed_job_registry.count)
+        yield jobs
+
+
+QUEUES = QueueCollector()
+
+if not multiprocess_dir():
+    REGISTRY.register(QUEUES)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Return the registry aggregating all processes, if configured."""
+    if not multiprocess_dir():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(QUEUES)
+    return registry
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        return HttpResponse(status=404)
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(generate_latest(metrics_registry()),
+                        content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,113 @@
+# Standard libraries
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Third-party suppliers
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+# Local imports
+from core.metrics import QueryTracker, async_execute_wrapper
+
+
+_timings: ContextVar[dict | None] = ContextVar("request_timings",
+                                               default=None)
+
+
+def query_debug_enabled() -> bool:
+    """Check whether responses carry query and timing headers."""
+    return bool(getattr(settings, "QUERY_DEBUG_HEADERS", False))
+
+
+@contextmanager
+def timing(name: str):
+    """Add the duration of the block to the current request's timings."""
+    timings = _timings.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            elapsed = time.perf_counter() - start
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def server_timing(timings: dict, queries: int) -> str:
+    """Return a Server-Timing header value of durations in seconds."""
+    parts = [f'db;dur={timings["db"] * 1000:.1f};desc="{queries} queries"']
+    parts += [f"{name};dur={timings[name] * 1000:.1f}"
+              for name in ("serialize", "render", "total") if name in timings]
+    return ", ".join(parts)
+
+
+class QueryDebugMiddleware:
+    """
+    Class representing the query debug middleware.
+
+    With QUERY_DEBUG_HEADERS on, adds the query count, DB time and
+    serializer time of a request as X-DB-* and Server-Timing headers.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle a request and add its timing headers."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not query_debug_enabled():
+            return self.get_response(request)
+        tracker, timings = QueryTracker(), {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(tracker):
+                response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.add_headers(response, tracker, timings, start)
+
+    async def __acall__(self, request):
+        """Handle an async request and add its timing headers."""
+        if not query_debug_enabled():
+            return await self.get_response(request)
+        tracker, timings = QueryTracker(), {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        try:
+            async with async_execute_wrapper(tracker):
+                response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.add_headers(response, tracker, timings, start)
+
+    def add_headers(self, response, tracker: QueryTracker, timings: dict,
+                    start: float):
+        """Add the query and timing headers to a response."""
+        timings["total"] = time.perf_counter() - start
+        timings["db"] = tracker.seconds
+        response["X-DB-Queries"] = str(tracker.count)
+        response["X-DB-Time-Ms"] = f"{tracker.seconds * 1000:.1f}"
+        response["X-Serializer-Time-Ms"] = (
+            f"{timings.get('serialize', 0.0) * 1000:.1f}")
+        response["Server-Timing"] = server_timing(timings, tracker.count)
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the rendering of DRF responses."""
+        timings = _timings.get()
+        if timings is not None:
+            start = time.perf_counter()
+
+            def rendered(_):
+                timings["render"] = time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
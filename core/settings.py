@@ -58,15 +58,17 @@ INSTALLED_APPS = [
     'auth_app.apps.AuthAppConfig',
     'token_app',
     'video_app.apps.VideoAppConfig',
-    'video_progress_app',
+    'video_progress_app.apps.VideoProgressAppConfig',
 ]
 
 AUTH_USER_MODEL = 'auth_app.User'
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.profiling.QueryDebugMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.staticfiles.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -100,6 +102,10 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
+# Serve the async list/detail/token-check views (run under ASGI)
+ASYNC_VIEWS = get_bool_env("ASYNC_VIEWS", False)
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -110,10 +116,26 @@ DATABASES = {
         "USER": os.environ.get("DB_USER", default="videoflix_user"),
         "PASSWORD": os.environ.get("DB_PASSWORD", default="supersecretpassword"),
         "HOST": os.environ.get("DB_HOST", default="db"),
-        "PORT": os.environ.get("DB_PORT", default=5432)
+        "PORT": os.environ.get("DB_PORT", default=5432),
+        # ASGI requests do not reuse persistent connections; use DB_POOL
+        "CONN_MAX_AGE": 0 if ASYNC_VIEWS else int(
+            os.environ.get("DB_CONN_MAX_AGE", default=60)),
+        "CONN_HEALTH_CHECKS": get_bool_env("DB_CONN_HEALTH_CHECKS", True),
     }
 }
 
+# Pool mode: a psycopg connection pool per worker process replaces
+# persistent connections (Django requires CONN_MAX_AGE=0 then)
+if get_bool_env("DB_POOL", False):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", default=2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", default=4)),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", default=10)),
+        },
+    }
+
 # add PASSWORD at OPTIONS if required
 CACHES = {
     "default": {
@@ -127,13 +149,33 @@ CACHES = {
 }
 
 # add PASSWORD after HOST if required
+RQ_CONNECTION = {
+    'HOST': os.environ.get("REDIS_HOST", default="redis"),
+    'PORT': os.environ.get("REDIS_PORT", default=6379),
+    'DB': os.environ.get("REDIS_DB", default=0),
+    'REDIS_CLIENT_KWARGS': {},
+}
+
+# transcode: process_video (hashes and probes the source first)
+# media-light: transcode hand-off, emails; housekeeping: sweeps and flushes
 RQ_QUEUES = {
     'default': {
-        'HOST': os.environ.get("REDIS_HOST", default="redis"),
-        'PORT': os.environ.get("REDIS_PORT", default=6379),
-        'DB': os.environ.get("REDIS_DB", default=0),
+        **RQ_CONNECTION,
         'DEFAULT_TIMEOUT': os.environ.get("RQ_TIMEOUT", default=900),
-        'REDIS_CLIENT_KWARGS': {},
+    },
+    'transcode': {
+        **RQ_CONNECTION,
+        'DEFAULT_TIMEOUT': os.environ.get("RQ_TRANSCODE_TIMEOUT",
+                                          default=3600),
+    },
+    'media-light': {
+        **RQ_CONNECTION,
+        'DEFAULT_TIMEOUT': os.environ.get("RQ_LIGHT_TIMEOUT", default=300),
+    },
+    'housekeeping': {
+        **RQ_CONNECTION,
+        'DEFAULT_TIMEOUT': os.environ.get("RQ_HOUSEKEEPING_TIMEOUT",
+                                          default=600),
     },
 }
 
@@ -178,6 +220,13 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# static: DEBUG-only django.conf.urls.static; stream: MediaView with byte
+# ranges; accel/sendfile: MediaView hands off to the front proxy.
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "static")
+MEDIA_REQUIRE_AUTH = get_bool_env("MEDIA_REQUIRE_AUTH", False)
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+MEDIA_CACHE_SECONDS = int(os.getenv("MEDIA_CACHE_SECONDS", 3600))
+
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Default primary key field type
@@ -186,10 +235,22 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# /metrics requires "Authorization: Bearer <token>" and answers 404 if no
+# token is set, unless DEBUG is on; gunicorn and RQ processes share
+# PROMETHEUS_MULTIPROC_DIR (read by prometheus_client)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# X-DB-Queries/X-DB-Time-Ms/X-Serializer-Time-Ms and Server-Timing headers
+QUERY_DEBUG_HEADERS = get_bool_env("QUERY_DEBUG_HEADERS", False)
+
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 60))
+TOKEN_SWEEP_INTERVAL = int(os.getenv("TOKEN_SWEEP_INTERVAL", 900))
+TOKEN_SWEEP_BATCH_SIZE = int(os.getenv("TOKEN_SWEEP_BATCH_SIZE", 1000))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
-        'knox.auth.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -220,8 +281,34 @@ DEFAULT_FROM_EMAIL = os.getenv(
 )
 SERVER_EMAIL = os.getenv("SERVER_EMAIL", DEFAULT_FROM_EMAIL)
 
+EMAIL_OUTBOX_ASYNC = get_bool_env("EMAIL_OUTBOX_ASYNC", True)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(
+    os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", 30))
+EMAIL_OUTBOX_RETENTION_HOURS = int(
+    os.getenv("EMAIL_OUTBOX_RETENTION_HOURS", 24))
+
 BACKEND_HOST = os.getenv("BACKEND_HOST", 'http://localhost:8000')
 
 FRONTEND_HOST = os.getenv("FRONTEND_HOST", 'http://localhost:4200')
 
 VIDEO_NEW_DAYS = 90
+
+VIDEO_CATALOG_CACHE = get_bool_env("VIDEO_CATALOG_CACHE", True)
+VIDEO_CATALOG_TTL = int(os.getenv("VIDEO_CATALOG_TTL", 300))
+VIDEO_PROGRESS_BUFFERED = get_bool_env("VIDEO_PROGRESS_BUFFERED", False)
+VIDEO_PROGRESS_FLUSH_SECONDS = int(
+    os.getenv("VIDEO_PROGRESS_FLUSH_SECONDS", 10))
+
+VIDEO_SINGLE_PASS = get_bool_env("VIDEO_SINGLE_PASS", False)
+
+VIDEO_CHUNK_SECONDS = int(os.getenv("VIDEO_CHUNK_SECONDS", 0))
+VIDEO_CHUNK_WORKERS = int(os.getenv("VIDEO_CHUNK_WORKERS", 0))
+VIDEO_SPRITE_INTERVAL = int(os.getenv("VIDEO_SPRITE_INTERVAL", 10))
+
+# process_video timeout: base seconds plus seconds per source second,
+# or DEFAULT seconds for sources without a stored duration
+VIDEO_TIMEOUT_BASE = int(os.getenv("VIDEO_TIMEOUT_BASE", 600))
+VIDEO_TIMEOUT_FACTOR = float(os.getenv("VIDEO_TIMEOUT_FACTOR", 4))
+VIDEO_TIMEOUT_DEFAULT = int(os.getenv("VIDEO_TIMEOUT_DEFAULT", 14400))
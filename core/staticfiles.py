@@ -0,0 +1,39 @@
+# Third-party suppliers
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoise
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoise):
+    """
+    Class representing an async-capable WhiteNoise middleware.
+
+    WhiteNoise is sync-only, which makes Django run every ASGI request
+    through a thread; here only static file hits stay synchronous.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        """Set up WhiteNoise and mark the instance async if needed."""
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Serve a static file or pass the request on."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    def static_file(self, request):
+        """Return the static file matching the request path, if any."""
+        if self.autorefresh:
+            return self.find_file(request.path_info)
+        return self.files.get(request.path_info)
+
+    async def __acall__(self, request):
+        """Serve a static file or await the next handler."""
+        static_file = self.static_file(request)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,27 @@
+# Third-party suppliers
+import pytest
+
+# Local imports
+from core import health
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_ready_when_all_checks_pass(client):
+    """Test for 200 once database, cache and migrations are ready."""
+    res = client.get("/ready/")
+    assert res.status_code == 200
+    assert res.json() == {"status": "ready", "checks": {
+        "database": "ok", "cache": "ok", "migrations": "ok"}}
+
+
+def test_unavailable_when_a_check_fails(client, monkeypatch):
+    """Test for 503 naming the failing dependency."""
+    def down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setitem(health.CHECKS, "cache", down)
+    res = client.get("/ready/")
+    assert res.status_code == 503
+    assert res.json()["checks"]["cache"] == "failed"
@@ -0,0 +1,34 @@
+# Third-party suppliers
+import pytest
+
+# Local imports
+from core.loadtest import percentile, remove_seed, run_load, seed
+from video_progress_app.models import VideoProgress
+
+
+def test_percentile_nearest_rank():
+    """Test for nearest-rank percentiles of sorted samples."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_run_reports_every_endpoint(live_server):
+    """Test for a run of two viewings per user against a live server."""
+    emails, video_ids = seed(users=2, videos=3)
+    assert seed(users=2, videos=3) == (emails, video_ids)
+    report = run_load(live_server.url, emails, video_ids, concurrency=1,
+                      duration=60, heartbeats=3, sessions=2)
+    endpoints = report["endpoints"]
+    assert set(endpoints) == {"login", "video-list", "video-detail",
+                              "video-progress-create",
+                              "video-progress-detail"}
+    assert all(row["errors"] == 0 for row in endpoints.values())
+    assert endpoints["video-list"]["requests"] == 2
+    assert (endpoints["video-progress-detail"]["requests"]
+            == 3 * endpoints["video-list"]["requests"])
+    assert VideoProgress.objects.exists()
+    remove_seed()
+    assert not VideoProgress.objects.exists()
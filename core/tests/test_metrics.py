@@ -0,0 +1,105 @@
+# Third-party suppliers
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+from knox.models import AuthToken
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+# Local imports
+from core.metrics import record_pool_stats, stage_timer
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    """Get APIClient authenticated with a knox token."""
+    user = get_user_model().objects.create_user(
+        email="user@mail.com", password="Pwd12345!")
+    _, token = AuthToken.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    return client
+
+
+def _sample(name: str, **labels) -> float:
+    """Return a sample of the default registry, 0 if missing."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_request_latency_and_queries_by_url_name(api_client):
+    """Test for recording latency and query counts per URL name."""
+    labels = {"view": "video-list", "method": "GET", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+    queries = _sample("http_request_db_queries_sum", view="video-list")
+    assert api_client.get(reverse("video_app:video-list")).status_code == 200
+    assert _sample("http_request_duration_seconds_count",
+                   **labels) == before + 1
+    assert _sample("http_request_db_queries_sum",
+                   view="video-list") > queries
+
+
+def test_cache_hits_and_misses_are_counted(api_client):
+    """Test for counting catalog cache misses and hits."""
+    miss = _sample("cache_lookups_total", cache="catalog", result="miss")
+    hit = _sample("cache_lookups_total", cache="catalog", result="hit")
+    api_client.get(reverse("video_app:video-list"))
+    api_client.get(reverse("video_app:video-list"))
+    assert _sample("cache_lookups_total",
+                   cache="catalog", result="miss") == miss + 1
+    assert _sample("cache_lookups_total",
+                   cache="catalog", result="hit") == hit + 1
+
+
+def test_metrics_endpoint_exposes_queues_and_stages(client, settings):
+    """Test for the text exposition with queue depths and stages."""
+    settings.METRICS_TOKEN = ""
+    settings.DEBUG = True
+    with stage_timer("probe"):
+        pass
+    res = client.get("/metrics")
+    body = res.content.decode()
+    assert res.status_code == 200
+    assert 'rq_jobs{queue="transcode",state="queued"}' in body
+    assert 'video_process_stage_seconds_count{stage="probe"}' in body
+
+
+def test_metrics_token_is_required_if_set(client, settings):
+    """Test for rejecting scrapes without the configured bearer token."""
+    settings.METRICS_TOKEN = "secret"
+    assert client.get("/metrics").status_code == 401
+    res = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    assert res.status_code == 200
+
+
+def test_metrics_are_hidden_without_token(client, settings):
+    """Test for denying scrapes if no token is configured outside DEBUG."""
+    settings.METRICS_TOKEN = ""
+    settings.DEBUG = False
+    assert client.get("/metrics").status_code == 404
+
+
+def test_unpooled_connections_are_counted():
+    """Test for counting connections opened without a pool."""
+    before = _sample("db_connections_opened_total", alias="default")
+    connection_created.send(sender=connection.__class__,
+                            connection=connection)
+    assert _sample("db_connections_opened_total",
+                   alias="default") == before + 1
+
+
+def test_pool_stats_are_published(monkeypatch):
+    """Test for exporting the statistics of a connection pool."""
+    class FakePool:
+        def get_stats(self):
+            return {"pool_size": 3, "pool_available": 1}
+
+    monkeypatch.setattr(type(connections["default"]), "pool", FakePool(),
+                        raising=False)
+    record_pool_stats()
+    assert _sample("db_pool", alias="default", stat="pool_size") == 3
+    assert _sample("db_pool", alias="default", stat="requests_waiting") == 0
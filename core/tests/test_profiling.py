@@ -0,0 +1,46 @@
+# Third-party suppliers
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from video_app.models import Video
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    """Get APIClient authenticated with a knox token."""
+    user = get_user_model().objects.create_user(
+        email="user@mail.com", password="Pwd12345!")
+    _, token = AuthToken.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    return client
+
+
+def test_debug_headers_report_queries_and_timings(api_client, settings):
+    """Test for query count, DB and serializer time headers."""
+    settings.QUERY_DEBUG_HEADERS = True
+    video = Video.objects.create(title="Wolf", genre="Nature")
+    res = api_client.get(reverse("video_app:video-detail",
+                                 kwargs={"pk": video.pk}))
+    assert res.status_code == 200
+    assert int(res["X-DB-Queries"]) > 0
+    assert float(res["X-DB-Time-Ms"]) >= 0
+    assert float(res["X-Serializer-Time-Ms"]) > 0
+    timing = res["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert f'desc="{res["X-DB-Queries"]} queries"' in timing
+    assert "serialize;dur=" in timing and "render;dur=" in timing
+
+
+def test_debug_headers_off_by_default(api_client):
+    """Test for no debug headers unless enabled."""
+    res = api_client.get(reverse("video_app:video-list"))
+    assert "X-DB-Queries" not in res
+    assert "Server-Timing" not in res
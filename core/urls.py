@@ -18,11 +18,18 @@ Including another URLconf
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+# Local imports
+from core.health import ready_view
+from core.metrics import metrics_view
+from video_app.api.views import MediaView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
+    path('ready/', ready_view, name='ready'),
     path('api-auth/', include('rest_framework.urls')),
     path('django-rq/', include('django_rq.urls')),
     path('api/', include('auth_app.api.urls')),
@@ -31,6 +38,11 @@ urlpatterns = [
     path('api/video-progress/', include('video_progress_app.api.urls')),
 ]
 
-if settings.DEBUG:
+if getattr(settings, "MEDIA_SERVE_MODE", "static") != "static":
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$",
+                MediaView.as_view(), name="media"),
+    ]
+elif settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL,
                           document_root=settings.MEDIA_ROOT)
@@ -1,7 +1,37 @@
 # Standard libraries
 import os
+import time
+
+# Third-party suppliers
+from django.core.cache import cache
 
 
 def get_bool_env(var_name: str, default: bool = False) -> bool:
     """Return boolean value from environment variable."""
     return os.getenv(var_name, str(default)).lower() in ("true", "1", "yes")
+
+
+def get_cache_version(key: str) -> int:
+    """Return a version counter from the cache, starting one if missing."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_cache_version(key: str) -> int:
+    """Async variant of get_cache_version for async views."""
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_cache_version(key: str) -> None:
+    """Move a version counter forward to invalidate derived entries."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
@@ -0,0 +1,7 @@
+# Third-party suppliers
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker from the metrics dir."""
+    multiprocess.mark_process_dead(worker.pid)
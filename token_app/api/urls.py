@@ -1,13 +1,23 @@
 # Third-party suppliers
+from django.conf import settings
 from django.urls import path
 
 # Local imports
-from token_app.api.views import ActivationTokenCheckView, TokenCheckView
+from token_app.api.views import (
+    ActivationTokenCheckView,
+    AsyncTokenCheckView,
+    TokenCheckView
+)
 
 app_name = "token_app"
 
+if getattr(settings, "ASYNC_VIEWS", False):
+    token_check_view = AsyncTokenCheckView
+else:
+    token_check_view = TokenCheckView
+
 urlpatterns = [
     path("activation-token-check/", ActivationTokenCheckView.as_view(),
          name="activation_token_check"),
-    path("token-check/", TokenCheckView.as_view(), name="token_check"),
+    path("token-check/", token_check_view.as_view(), name="token_check"),
 ]
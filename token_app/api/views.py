@@ -1,5 +1,4 @@
 # Third-party suppliers
-from knox.auth import TokenAuthentication as KnoxAuth
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -7,6 +6,8 @@ from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
 
 # Local imports
+from auth_app.authentication import CachedTokenAuthentication
+from core.async_api import AsyncAPIView, json_response
 from token_app.api.serializers import ActivationTokenCheckSerializer
 from token_app.utils import resolve_knox_token
 
@@ -41,7 +42,7 @@ class TokenCheckView(APIView):
 
     Validates a token.
     """
-    authentication_classes = [KnoxAuth]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -51,3 +52,19 @@ class TokenCheckView(APIView):
         data = {"token": token, "email": request.user.email,
                 "user_id": request.user.id}
         return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncTokenCheckView(AsyncAPIView):
+    """
+    Class representing an async token check view.
+
+    Validates a token like TokenCheckView; cached tokens never leave
+    the event loop.
+    """
+
+    async def post(self, request):
+        """Post a token and perform token check."""
+        auth = request.META.get("HTTP_AUTHORIZATION", "")
+        token = auth.split(" ", 1)[1] if auth.startswith("Token ") else ""
+        return json_response({"token": token, "email": request.user.email,
+                              "user_id": request.user.id})
@@ -0,0 +1,39 @@
+# Standard libraries
+import json
+
+# Third-party suppliers
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+# Local imports
+from auth_app.tests.utils.factories import make_user
+from auth_app.utils import create_knox_token
+from token_app.api.views import AsyncTokenCheckView
+
+
+def _post(headers: dict):
+    """Call the async token check view."""
+    request = AsyncRequestFactory().post("/api/token/token-check/",
+                                         headers=headers)
+    return async_to_sync(AsyncTokenCheckView.as_view())(request)
+
+
+@pytest.mark.django_db
+def test_async_token_check_success():
+    """Test for a valid token, first from the DB, then from the cache."""
+    user = make_user(email="john.doe@mail.com", is_active=True)
+    token = create_knox_token(user, hours=1)
+    for _ in range(2):
+        res = _post({"Authorization": f"Token {token}"})
+        assert res.status_code == 200
+        assert json.loads(res.content) == {
+            "token": token, "email": "john.doe@mail.com", "user_id": user.id}
+
+
+@pytest.mark.django_db
+def test_async_token_check_rejects_inactive_user():
+    """Test for 401 for tokens of inactive users."""
+    user = make_user(email="john.doe@mail.com", is_active=False)
+    token = create_knox_token(user, hours=1)
+    assert _post({"Authorization": f"Token {token}"}).status_code == 401
@@ -17,14 +17,15 @@ class VideoAdmin(admin.ModelAdmin):
     )
     readonly_fields = (
         "duration_whole", "quality_labels", "hls_playlist",
-        "preview", "thumbnail", "created_at",
+        "preview", "thumbnail", "sprites_vtt", "content_hash", "created_at",
     )
     fieldsets = (
-        ("Basic info", {"fields": ("title", "genre",
-                                   "description", "video_file")}),
+        ("Basic info", {"fields": ("title", "genre", "description",
+                                   "video_file", "segment_format")}),
         ("Generated assets", {
             "fields": ("duration_whole", "quality_labels", "hls_playlist",
-                       "preview", "thumbnail"),
+                       "preview", "thumbnail", "sprites_vtt",
+                       "content_hash"),
             "description": "Automatically generated fields.",
         }),
         ("Dates", {"fields": ("created_at",)}),
@@ -1,4 +1,5 @@
 # Third-party suppliers
+from django.utils import timezone
 from rest_framework import serializers
 
 # Local imports
@@ -34,6 +35,42 @@ class VideoListItemSerializer(OmitNoneModelSerializer):
                   "progress_id", "relative_position")
 
 
+def file_url(value, request) -> str | None:
+    """Represent a file like DRF's FileField (absolute URL or None)."""
+    if not value:
+        return None
+    url = value.url
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def iso_datetime(value) -> str:
+    """Represent a datetime like DRF's ISO 8601 DateTimeField."""
+    text = timezone.localtime(value).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def encode_list_item(video: Video, request) -> dict:
+    """
+    Encode a video like VideoListItemSerializer, without DRF overhead.
+
+    Must stay in sync with VideoListItemSerializer.Meta.fields.
+    """
+    data = {
+        "id": video.id, "title": video.title, "genre": video.genre,
+        "description": video.description,
+        "preview": file_url(video.preview, request),
+        "thumbnail": file_url(video.thumbnail, request),
+        "created_at": iso_datetime(video.created_at),
+    }
+    progress_id = getattr(video, "progress_id", None)
+    if progress_id is not None:
+        data["progress_id"] = int(progress_id)
+    relative_position = getattr(video, "relative_position", None)
+    if relative_position is not None:
+        data["relative_position"] = float(relative_position)
+    return {k: v for k, v in data.items() if v is not None}
+
+
 class VideoDetailSerializer(OmitNoneModelSerializer):
     """
     Class representing a video detail serializer.
@@ -47,5 +84,5 @@ class VideoDetailSerializer(OmitNoneModelSerializer):
         model = Video
         fields = ("id", "title", "genre", "description", "duration",
                   "hls_playlist", "quality_levels", "preview",
-                  "thumbnail", "created_at", "progress_id",
+                  "thumbnail", "sprites_vtt", "created_at", "progress_id",
                   "last_position")
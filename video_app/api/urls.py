@@ -1,12 +1,28 @@
 # Third-party suppliers
+from django.conf import settings
 from django.urls import path
 
 # Local imports
-from .views import VideoDetailView, VideoListView
+from .views import (
+    AsyncVideoDetailView,
+    AsyncVideoListView,
+    VideoDetailView,
+    VideoListView,
+    VideoSectionPageView,
+    VideoSectionsView,
+)
 
 app_name = "video_app"
 
+if getattr(settings, "ASYNC_VIEWS", False):
+    list_view, detail_view = AsyncVideoListView, AsyncVideoDetailView
+else:
+    list_view, detail_view = VideoListView, VideoDetailView
+
 urlpatterns = [
-    path("", VideoListView.as_view(), name="video-list"),
-    path("<int:pk>/", VideoDetailView.as_view(), name="video-detail"),
+    path("", list_view.as_view(), name="video-list"),
+    path("<int:pk>/", detail_view.as_view(), name="video-detail"),
+    path("sections/", VideoSectionsView.as_view(), name="video-sections"),
+    path("sections/page/", VideoSectionPageView.as_view(),
+         name="video-section-page"),
 ]
@@ -1,16 +1,54 @@
+# Standard libraries
+import os
+from pathlib import Path
+
 # Third-party suppliers
-from knox.auth import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Local imports
+from auth_app.authentication import CachedTokenAuthentication
+from core.async_api import AsyncAPIView, json_response
+from core.profiling import timing
+from video_app.media import (
+    cache_control,
+    hand_off,
+    media_requires_auth,
+    media_serve_mode,
+    stream_file
+)
 from video_app.models import Video
 from video_app.utils import (
     annotate_detail_with_progress,
     annotate_with_progress
 )
-from video_app.utils import build_list_payload
+from video_app.utils import (
+    adetail_validators,
+    aget_catalog,
+    alist_etag,
+    auser_progress,
+    build_catalog_payload,
+    build_list_payload,
+    catalog_cache_enabled,
+    detail_validators,
+    get_catalog,
+    list_etag,
+    not_modified,
+    page_size,
+    section_index,
+    section_page,
+    section_queryset,
+    set_validators,
+    user_progress
+)
+from video_progress_app.buffer import merge_buffered_progress
 from .serializers import VideoDetailSerializer
 
 
@@ -19,33 +57,194 @@ class VideoListView(APIView):
     Class representing a video list view.
 
     List video items sorted by genre. Videos are sorted by created_at.
+    The user-independent catalog is cached; progress is overlaid per user.
+    Unchanged lists are answered with 304 via the ETag.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """Get video list."""
-        qs = Video.objects.all().order_by("-created_at", "title")
-        qs = annotate_with_progress(qs, request.user.id)
-        payload = build_list_payload(list(qs), request)
-        return Response(payload)
+        etag = list_etag(request.user.id)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return set_validators(cached, etag)
+        if catalog_cache_enabled():
+            catalog = get_catalog()
+            progress = user_progress(request.user.id)
+            with timing("serialize"):
+                payload = build_catalog_payload(catalog, progress, request)
+        else:
+            qs = Video.objects.all().order_by("-created_at", "title")
+            videos = list(annotate_with_progress(qs, request.user.id))
+            merge_buffered_progress(videos, request.user.id,
+                                    "relative_position")
+            with timing("serialize"):
+                payload = build_list_payload(videos, request)
+        return set_validators(Response(payload), etag)
 
 
 class VideoDetailView(APIView):
     """
     Class representing a video detail view.
 
-    Retrieve video with all details.
+    Retrieve video with all details. Unchanged videos are answered with
+    304 via ETag/Last-Modified.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk: int):
         """Get video detail."""
+        validators = detail_validators(pk, request.user.id)
+        if validators is None:
+            return Response({"detail": "Not found."}, status=404)
+        cached = not_modified(request, *validators)
+        if cached is not None:
+            return set_validators(cached, *validators)
         qs = annotate_detail_with_progress(Video.objects.filter(pk=pk),
                                            request.user.id)
         video = qs.first()
         if not video:
             return Response({"detail": "Not found."}, status=404)
-        ser = VideoDetailSerializer(video, context={"request": request})
-        return Response(ser.data)
+        merge_buffered_progress([video], request.user.id, "last_position")
+        with timing("serialize"):
+            data = VideoDetailSerializer(video,
+                                         context={"request": request}).data
+        return set_validators(Response(data), *validators)
+
+
+class AsyncVideoListView(AsyncAPIView):
+    """
+    Class representing an async video list view.
+
+    Same payload and validators as VideoListView, using the async ORM
+    and cache so an ASGI worker can hold many requests at once.
+    """
+
+    async def get(self, request):
+        """Get video list."""
+        user_id = request.user.id
+        etag = await alist_etag(user_id)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return set_validators(cached, etag)
+        if catalog_cache_enabled():
+            catalog = await aget_catalog()
+            progress = await auser_progress(user_id)
+            with timing("serialize"):
+                payload = build_catalog_payload(catalog, progress, request)
+        else:
+            qs = Video.objects.all().order_by("-created_at", "title")
+            videos = [v async for v in annotate_with_progress(qs, user_id)]
+            await sync_to_async(merge_buffered_progress)(
+                videos, user_id, "relative_position")
+            with timing("serialize"):
+                payload = build_list_payload(videos, request)
+        return set_validators(json_response(payload), etag)
+
+
+class AsyncVideoDetailView(AsyncAPIView):
+    """
+    Class representing an async video detail view.
+
+    Same payload and validators as VideoDetailView, using the async ORM.
+    """
+
+    async def get(self, request, pk: int):
+        """Get video detail."""
+        user_id = request.user.id
+        validators = await adetail_validators(pk, user_id)
+        if validators is None:
+            return json_response({"detail": "Not found."}, status=404)
+        cached = not_modified(request, *validators)
+        if cached is not None:
+            return set_validators(cached, *validators)
+        qs = annotate_detail_with_progress(Video.objects.filter(pk=pk),
+                                           user_id)
+        video = await qs.afirst()
+        if not video:
+            return json_response({"detail": "Not found."}, status=404)
+        await sync_to_async(merge_buffered_progress)(
+            [video], user_id, "last_position")
+        with timing("serialize"):
+            data = VideoDetailSerializer(video,
+                                         context={"request": request}).data
+        return set_validators(json_response(data), *validators)
+
+
+class VideoSectionsView(APIView):
+    """
+    Class representing a video sections view.
+
+    Lists the section names of the video list with their video counts.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Get video sections."""
+        return Response(section_index(request.user.id))
+
+
+class VideoSectionPageView(APIView):
+    """
+    Class representing a video section page view.
+
+    Pages through one section with a (created_at, id) cursor.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Get one page of a video section."""
+        title = request.query_params.get("genre", "")
+        if not title:
+            return Response({"genre": ["This field is required."]},
+                            status=400)
+        qs = section_queryset(title, request.user.id)
+        try:
+            items, cursor = section_page(
+                qs, request.query_params.get("cursor"),
+                page_size(request.query_params.get("limit")), request)
+        except ValueError:
+            return Response({"detail": "Invalid cursor."}, status=400)
+        return Response({"genre": title, "videos": items, "next": cursor})
+
+
+class MediaView(APIView):
+    """
+    Class representing a media file view.
+
+    Authorizes media requests and serves the file by the configured
+    mode: handed off to the proxy (X-Accel-Redirect/X-Sendfile) or
+    streamed with byte-range support.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get_permissions(self):
+        """Require authentication only if media access is protected."""
+        if media_requires_auth():
+            return [IsAuthenticated()]
+        return [AllowAny()]
+
+    def get(self, request, path: str):
+        """Get a media file or a byte range of it."""
+        try:
+            full = Path(safe_join(settings.MEDIA_ROOT, path))
+        except SuspiciousFileOperation:
+            raise Http404
+        rel = Path(os.path.relpath(full, settings.MEDIA_ROOT)).as_posix()
+        hidden = any(part.startswith(".") for part in rel.split("/"))
+        if hidden or not full.is_file():
+            raise Http404
+        stat = full.stat()
+        mode = media_serve_mode()
+        if mode in ("accel", "sendfile"):
+            res = hand_off(rel, mode)
+        else:
+            res = stream_file(request, full, stat.st_size)
+        res["Accept-Ranges"] = "bytes"
+        res["Cache-Control"] = cache_control(full)
+        res["Last-Modified"] = http_date(stat.st_mtime)
+        return res
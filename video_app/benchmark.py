@@ -0,0 +1,153 @@
+# Standard libraries
+import os
+import resource
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Local imports
+from . import tasks
+from .models import Video
+
+
+FRAME_RATE = 30
+POLL_SECONDS = 0.02
+
+
+def parse_sizes(value: str) -> list[tuple[int, int]]:
+    """Return (width, height) pairs of a list like '640x360,1280x720'."""
+    pairs = [part.lower().split("x") for part in value.split(",") if part]
+    return [(int(width), int(height)) for width, height in pairs]
+
+
+def parse_durations(value: str) -> list[int]:
+    """Return the durations in seconds of a list like '10,60'."""
+    return [int(part) for part in value.split(",") if part]
+
+
+def generate_source(work: Path, width: int, height: int, dur: int) -> Path:
+    """Render a synthetic test pattern with a sine tone to an MP4."""
+    outp = work / f"src_{width}x{height}_{dur}s.mp4"
+    if not outp.exists():
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error",
+             "-f", "lavfi", "-i",
+             f"testsrc2=size={width}x{height}:rate={FRAME_RATE}"
+             f":duration={dur}",
+             "-f", "lavfi", "-i", f"sine=frequency=440:duration={dur}",
+             "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+             "-c:a", "aac", "-shortest", str(outp)],
+            check=True)
+    return outp
+
+
+def synthetic_meta(src: Path, width: int, height: int, dur: int) -> dict:
+    """Return probe metadata, known upfront for generated sources."""
+    if shutil.which("ffprobe"):
+        return tasks.probe_source(src)
+    bitrate = int(src.stat().st_size * 8 / dur) if dur else 0
+    return {"duration": float(dur), "width": width, "height": height,
+            "fps": float(FRAME_RATE), "bitrate": bitrate}
+
+
+def peak_rss_kib(pid: int) -> int:
+    """Return the peak RSS (VmHWM) of a running process in KiB, 0 if gone."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def run_measured(cmd: list[str], runs: list[dict]) -> None:
+    """Run a command like tasks._run and record its CPU time and peak RSS.
+
+    The child's ru_maxrss keeps the parent's high-water mark across
+    fork/exec, so the peak is polled from /proc (0 where unavailable).
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+    peak = 0
+    while True:
+        peak = max(peak, peak_rss_kib(proc.pid))
+        pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            break
+        time.sleep(POLL_SECONDS)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    runs.append({"cpu": usage.ru_utime + usage.ru_stime, "rss": peak})
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+@contextmanager
+def measured_commands(runs: list[dict]):
+    """Route the ffmpeg calls of video_app.tasks through run_measured."""
+    original = tasks._run
+    tasks._run = lambda cmd: run_measured(cmd, runs)
+    try:
+        yield runs
+    finally:
+        tasks._run = original
+
+
+def rss_mb(kib: int) -> float:
+    """Convert KiB to MiB."""
+    return round(kib / 1024, 1)
+
+
+def timed(func, *args) -> tuple[dict, object]:
+    """Run func and return wall/CPU time and peak child RSS with its result."""
+    runs: list[dict] = []
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    with measured_commands(runs):
+        result = func(*args)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    own_cpu = (after.ru_utime - own.ru_utime) + (after.ru_stime - own.ru_stime)
+    stats = {
+        "wall_s": round(wall, 3),
+        "cpu_s": round(own_cpu + sum(r["cpu"] for r in runs), 3),
+        "peak_rss_mb": rss_mb(max((r["rss"] for r in runs), default=0)),
+        "commands": len(runs),
+    }
+    return stats, result
+
+
+def tree_size(path: Path) -> dict:
+    """Return the byte and file count of the files under path."""
+    if not path.is_dir():
+        return {"bytes": 0, "files": 0}
+    files = [p for p in path.rglob("*") if p.is_file()]
+    return {"bytes": sum(p.stat().st_size for p in files),
+            "files": len(files)}
+
+
+def benchmark_source(src: Path, root: Path, width: int, height: int,
+                     dur: int, fmt: str = Video.SEGMENT_TS) -> dict:
+    """Run the process_video stages for src under root and measure them."""
+    stages = {}
+    stages["probe"], meta = timed(synthetic_meta, src, width, height, dur)
+    stages["hash"], _ = timed(tasks.file_sha256, src)
+    dur, ladder = meta["duration"], tasks.build_ladder(meta)
+    size = tasks.sprite_size(meta)
+    stages["ladder"], decoded = timed(
+        tasks.transcode_ladder, src, root, ladder, dur, None, fmt, size,
+        meta["fps"])
+    stages["sprites"], _ = timed(
+        tasks.make_sprites, src, root, dur, size, decoded)
+    stages["preview"], _ = timed(tasks.make_preview, src, root)
+    stages["thumbnail"], _ = timed(tasks.make_thumbnail, src, root, dur)
+    rungs = {folder: {"resolution": res, "bitrate": vbr,
+                      **tree_size(root / "hls" / folder)}
+             for folder, res, vbr, *_ in ladder}
+    total = sum(stage["wall_s"] for stage in stages.values())
+    return {"stages": stages, "rungs": rungs,
+            "sprites": tree_size(root / "sprites"),
+            "total_wall_s": round(total, 3)}
@@ -0,0 +1,75 @@
+# Standard libraries
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+
+CHECKPOINT_NAME = ".checkpoint.json"
+
+
+def source_fingerprint(src: Path) -> str:
+    """Return a cheap fingerprint of a source file (size and mtime)."""
+    stat = src.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write text to a temp file and rename it over path."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def publish(tmp: Path, final: Path) -> None:
+    """Move a finished file or directory into place in one rename."""
+    if final.is_dir() and tmp.is_dir():
+        shutil.rmtree(final)
+    os.replace(tmp, final)
+
+
+def is_valid_output(path: Path) -> bool:
+    """Check an output file for existence and content."""
+    return path.is_file() and path.stat().st_size > 0
+
+
+class Checkpoint:
+    """
+    Class representing a processing checkpoint of one video.
+
+    Records finished pipeline stages next to the outputs so a retried
+    job can skip them. A changed source invalidates all stages.
+    """
+
+    def __init__(self, root: Path, src: Path):
+        """Load the checkpoint for src or start a fresh one."""
+        self.path = root / CHECKPOINT_NAME
+        self.source = source_fingerprint(src)
+        self.stages: dict[str, Any] = {}
+        data = self._read()
+        if data.get("source") == self.source:
+            self.stages = data.get("stages", {})
+
+    def _read(self) -> dict:
+        """Read the stored checkpoint, ignoring missing or broken files."""
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, stage: str, default: Any = None) -> Any:
+        """Return the value recorded for a finished stage."""
+        return self.stages.get(stage, default)
+
+    def done(self, stage: str, *outputs: Path) -> bool:
+        """Check a stage for completion with all outputs still valid."""
+        return (stage in self.stages
+                and all(is_valid_output(p) for p in outputs))
+
+    def mark(self, stage: str, value: Any = True) -> Any:
+        """Record a finished stage and persist the checkpoint."""
+        self.stages[stage] = value
+        data = {"source": self.source, "stages": self.stages}
+        write_text_atomic(self.path, json.dumps(data))
+        return value
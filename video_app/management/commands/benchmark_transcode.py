@@ -0,0 +1,106 @@
+# Standard libraries
+import json
+import platform
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Third-party suppliers
+from django.core.management.base import BaseCommand, CommandError
+
+# Local imports
+from video_app import tasks
+from video_app.benchmark import (
+    benchmark_source,
+    generate_source,
+    parse_durations,
+    parse_sizes
+)
+from video_app.models import Video
+
+
+def _output(cmd: list[str]) -> str:
+    """Return the first output line of cmd or an empty string."""
+    try:
+        out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.decode().splitlines()[0].strip() if out else ""
+
+
+def environment() -> dict:
+    """Return the revision, tools and settings a run was measured with."""
+    return {
+        "commit": _output(["git", "rev-parse", "--short", "HEAD"]),
+        "ffmpeg": _output(["ffmpeg", "-version"]),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "single_pass": tasks.single_pass_enabled(),
+        "chunk_seconds": tasks.chunk_seconds(),
+        "chunk_workers": tasks.chunk_workers(),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Class representing the benchmark_transcode command.
+
+    Renders synthetic sources with ffmpeg and runs the process_video
+    stages on them, reporting wall time, CPU time, peak RSS and output
+    bytes per rung as JSON for comparison across commits.
+    """
+    help = "Benchmark the transcoding pipeline on synthetic sources."
+
+    def add_arguments(self, parser):
+        """Add source, format and output options."""
+        parser.add_argument("--sizes", default="640x360,1280x720,1920x1080",
+                            help="Comma separated source resolutions.")
+        parser.add_argument("--durations", default="10,60",
+                            help="Comma separated source durations (s).")
+        parser.add_argument("--format", dest="fmt", default=Video.SEGMENT_TS,
+                            choices=[Video.SEGMENT_TS, Video.SEGMENT_FMP4])
+        parser.add_argument("--workdir",
+                            help="Directory for sources and outputs.")
+        parser.add_argument("--output", help="Write the JSON report here.")
+        parser.add_argument("--keep", action="store_true",
+                            help="Keep generated sources and outputs.")
+
+    def handle(self, *args, **options):
+        """Run every size/duration case and print the JSON report."""
+        if not shutil.which("ffmpeg"):
+            raise CommandError("ffmpeg is required for the benchmark.")
+        try:
+            sizes = parse_sizes(options["sizes"])
+            durations = parse_durations(options["durations"])
+        except ValueError as exc:
+            raise CommandError(f"Invalid case list: {exc}")
+        work = Path(options["workdir"] or tempfile.mkdtemp(prefix="bench-"))
+        work.mkdir(parents=True, exist_ok=True)
+        report = {"environment": environment(), "format": options["fmt"],
+                  "cases": []}
+        try:
+            for width, height in sizes:
+                for dur in durations:
+                    report["cases"].append(self.run_case(
+                        work, width, height, dur, options["fmt"]))
+        finally:
+            if not options["keep"]:
+                shutil.rmtree(work, ignore_errors=True)
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(text + "\n")
+        self.stdout.write(text)
+
+    def run_case(self, work: Path, width: int, height: int, dur: int,
+                 fmt: str) -> dict:
+        """Generate one source and measure its processing."""
+        case = f"{width}x{height}_{dur}s"
+        self.stderr.write(f"benchmarking {case} ...")
+        src = generate_source(work, width, height, dur)
+        root = work / case
+        shutil.rmtree(root, ignore_errors=True)
+        result = benchmark_source(src, root, width, height, dur, fmt)
+        return {"case": case, "width": width, "height": height,
+                "duration": dur, "source_bytes": src.stat().st_size,
+                **result}
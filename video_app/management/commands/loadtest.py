@@ -0,0 +1,73 @@
+# Standard libraries
+import json
+from pathlib import Path
+
+# Third-party suppliers
+from django.core.management.base import BaseCommand, CommandError
+
+# Local imports
+from core.loadtest import remove_seed, run_load, seed
+
+
+class Command(BaseCommand):
+    """
+    Class representing the loadtest command.
+
+    Seeds load test users and videos, replays viewing sessions (login,
+    list, detail, progress with heartbeats) against a running stack and
+    reports p50/p95/p99 latency and throughput per endpoint.
+    """
+    help = "Load test the API of a running stack with seeded data."
+
+    def add_arguments(self, parser):
+        """Add stack, seed and load mix options."""
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--videos", type=int, default=50)
+        parser.add_argument("--concurrency", type=int, default=10,
+                            help="Virtual users running in parallel.")
+        parser.add_argument("--duration", type=float, default=30,
+                            help="Seconds each virtual user runs after "
+                                 "its login.")
+        parser.add_argument("--sessions", type=int, default=0,
+                            help="Stop each virtual user after this many "
+                                 "viewings (0 = no limit).")
+        parser.add_argument("--heartbeats", type=int, default=10,
+                            help="Progress heartbeats per list view.")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="Random seed of the virtual users.")
+        parser.add_argument("--output", help="Write the JSON report here.")
+        parser.add_argument("--cleanup", action="store_true",
+                            help="Delete the seeded users and videos.")
+
+    def handle(self, *args, **options):
+        """Seed, run the load and print the report."""
+        if min(options["users"], options["videos"],
+               options["concurrency"]) < 1:
+            raise CommandError("users, videos and concurrency must be >= 1.")
+        emails, video_ids = seed(options["users"], options["videos"])
+        try:
+            report = run_load(options["base_url"], emails, video_ids,
+                              options["concurrency"], options["duration"],
+                              options["heartbeats"], options["seed"],
+                              options["sessions"])
+        finally:
+            if options["cleanup"]:
+                remove_seed()
+        if options["output"]:
+            Path(options["output"]).write_text(
+                json.dumps(report, indent=2) + "\n")
+        self.print_report(report)
+
+    def print_report(self, report: dict) -> None:
+        """Print one line per endpoint and the totals."""
+        self.stdout.write(f"{'endpoint':<24}{'reqs':>8}{'err':>6}"
+                          f"{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for name, row in report["endpoints"].items():
+            self.stdout.write(
+                f"{name:<24}{row['requests']:>8}{row['errors']:>6}"
+                f"{row['rps']:>9}{row['p50_ms']:>9}{row['p95_ms']:>9}"
+                f"{row['p99_ms']:>9}")
+        self.stdout.write(f"{report['requests']} requests in "
+                          f"{report['elapsed_s']}s ({report['rps']} rps, "
+                          f"{report['concurrency']} virtual users)")
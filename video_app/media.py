@@ -0,0 +1,112 @@
+# Standard libraries
+import mimetypes
+import re
+from pathlib import Path
+
+# Third-party suppliers
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+SEGMENT_SUFFIXES = {".ts", ".m4s"}
+PLAYLIST_SUFFIXES = {".m3u8", ".vtt"}
+IMMUTABLE = "max-age=31536000, immutable"
+
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+mimetypes.add_type("video/iso.segment", ".m4s")
+
+
+def media_serve_mode() -> str:
+    """Return how media files are served (static/stream/accel/sendfile)."""
+    return getattr(settings, "MEDIA_SERVE_MODE", "static")
+
+
+def media_requires_auth() -> bool:
+    """Check whether media requests need a valid token."""
+    return bool(getattr(settings, "MEDIA_REQUIRE_AUTH", False))
+
+
+def cache_control(path: Path) -> str:
+    """Return Cache-Control for a media file by its kind."""
+    scope = "private" if media_requires_auth() else "public"
+    if path.suffix in SEGMENT_SUFFIXES:
+        return f"{scope}, {IMMUTABLE}"
+    if path.suffix in PLAYLIST_SUFFIXES:
+        return f"{scope}, no-cache"
+    age = int(getattr(settings, "MEDIA_CACHE_SECONDS", 3600))
+    return f"{scope}, max-age={age}"
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Return the inclusive (start, end) of a single byte range or None."""
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError("Unsatisfiable range.")
+    return start, end
+
+
+class FileRange:
+    """
+    Class representing a byte range of an open file.
+
+    Reads stop at the end of the range so FileResponse streams only it.
+    """
+
+    def __init__(self, file, start: int, length: int):
+        """Position file at start and limit reads to length bytes."""
+        file.seek(start)
+        self.file, self.remaining, self.name = file, length, file.name
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes from the remaining range."""
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self.file.close()
+
+
+def stream_file(request, path: Path, size: int):
+    """Return a full or single-range FileResponse for path."""
+    try:
+        byte_range = parse_range(request.headers.get("Range", ""), size)
+    except ValueError:
+        res = HttpResponse(status=416)
+        res["Content-Range"] = f"bytes */{size}"
+        return res
+    if byte_range is None:
+        return FileResponse(path.open("rb"))
+    start, end = byte_range
+    length = end - start + 1
+    res = FileResponse(FileRange(path.open("rb"), start, length), status=206)
+    res["Content-Length"] = str(length)
+    res["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return res
+
+
+def hand_off(path: str, mode: str) -> HttpResponse:
+    """Return an empty response telling the proxy to send the file."""
+    res = HttpResponse()
+    if mode == "accel":
+        prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+        res["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{path}"
+    else:
+        res["X-Sendfile"] = str(Path(settings.MEDIA_ROOT) / path)
+    content_type, _ = mimetypes.guess_type(path)
+    res["Content-Type"] = content_type or "application/octet-stream"
+    return res
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0002_video_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['-created_at', '-id'], name='video_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['genre', '-created_at', '-id'], name='video_genre_created_id_idx'),
+        ),
+    ]
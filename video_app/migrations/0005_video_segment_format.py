@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0004_video_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='segment_format',
+            field=models.CharField(choices=[('ts', 'MPEG-TS segments'), ('fmp4', 'fMP4 single file (byte ranges)')], default='ts', max_length=8),
+        ),
+    ]
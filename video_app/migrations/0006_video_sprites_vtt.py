@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:20
+
+import video_app.storage_backends
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0005_video_segment_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='sprites_vtt',
+            field=models.FileField(blank=True, storage=video_app.storage_backends.OverrideStorage(), upload_to='videos/sprites/'),
+        ),
+    ]
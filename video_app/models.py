@@ -7,6 +7,13 @@ from .storage_backends import OverrideStorage
 
 class Video(models.Model):
     """Class representing a video and its derived HLS assets."""
+    SEGMENT_TS = "ts"
+    SEGMENT_FMP4 = "fmp4"
+    SEGMENT_FORMAT_CHOICES = [
+        (SEGMENT_TS, "MPEG-TS segments"),
+        (SEGMENT_FMP4, "fMP4 single file (byte ranges)"),
+    ]
+
     title = models.CharField(max_length=200, default="")
     genre = models.CharField(max_length=100, default="")
     description = models.TextField(blank=True, default="")
@@ -20,16 +27,32 @@ class Video(models.Model):
         storage=OverrideStorage()
     )
     quality_levels = models.JSONField(default=list, blank=True)
+    segment_format = models.CharField(
+        max_length=8, choices=SEGMENT_FORMAT_CHOICES, default=SEGMENT_TS
+    )
     preview = models.FileField(
         upload_to="videos/previews/", blank=True, storage=OverrideStorage()
     )
     thumbnail = models.ImageField(
         upload_to="videos/thumbs/", blank=True, storage=OverrideStorage()
     )
+    sprites_vtt = models.FileField(
+        upload_to="videos/sprites/", blank=True, storage=OverrideStorage()
+    )
+    content_hash = models.CharField(
+        max_length=64, blank=True, default="", db_index=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"],
+                         name="video_created_id_idx"),
+            models.Index(fields=["genre", "-created_at", "-id"],
+                         name="video_genre_created_id_idx"),
+        ]
 
     def __str__(self) -> str:
         """Represent a video by title."""
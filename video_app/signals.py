@@ -1,15 +1,24 @@
 # Third-party suppliers
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 import django_rq
 
 # Local imports
 from .models import Video
-from .tasks import process_video
+from .tasks import enqueue_transcode
+from .utils import bump_catalog_version
 
 
 @receiver(post_save, sender=Video)
 def enqueue_processing(sender, instance: Video, created: bool, **kwargs):
     """Queue processing when a video file exists."""
     if instance.video_file and (created or not instance.hls_playlist):
-        django_rq.enqueue(process_video, instance.id)
+        django_rq.get_queue("media-light").enqueue(enqueue_transcode,
+                                                   instance.id)
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def invalidate_catalog(sender, instance: Video, **kwargs):
+    """Bump the catalog version whenever a video changes."""
+    bump_catalog_version()
@@ -1,21 +1,38 @@
 # Standard libraries
 import json
+import logging
+import math
+import os
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Third-party suppliers
+import django_rq
+from django.conf import settings
 from django.db import transaction
 
 # Local imports
+from core.metrics import stage_timer
+from .checkpoints import (
+    Checkpoint,
+    is_valid_output,
+    publish,
+    write_text_atomic
+)
 from .models import Video
 from .utils import (
     MEDIA_ROOT,
     ensure_dirs,
+    file_sha256,
     quality_payload,
     video_name_from_path
 )
 
 
+logger = logging.getLogger(__name__)
+
 LADDER = [
     ("v0", "1920x1080", "5000k", 6000000, 5000000),
     ("v1", "1280x720",  "2800k", 3500000, 2800000),
@@ -23,8 +40,24 @@ LADDER = [
     ("v3", "256x144",   "200k",   400000,  300000),
 ]
 
-CODECS_V = "avc1.640028"
+CODECS_V = "avc1.6400{level:02x}"
 CODECS_A = "mp4a.40.2"
+RUNG_LEVELS = [(1080, "4.0"), (720, "3.1"), (360, "3.0"), (0, "2.1")]
+MAX_FPS = 30.0
+SEGMENT_SECONDS = 2
+
+SPRITE_WIDTH = 160
+SPRITE_COLS = 5
+SPRITE_ROWS = 5
+SPRITE_VTT = "sprites.vtt"
+
+THUMBNAIL_OFFSET = 5.0
+
+OPTIONAL_ASSETS = {
+    "preview": "previews/preview.mp4",
+    "thumbnail": "thumbs/thumb.jpg",
+    "sprites_vtt": f"sprites/{SPRITE_VTT}",
+}
 
 
 def _run(cmd: list[str]) -> None:
@@ -32,95 +65,559 @@ def _run(cmd: list[str]) -> None:
     subprocess.run(cmd, check=True)
 
 
-def probe_duration(src: Path) -> float:
-    """Return media duration in seconds via ffprobe."""
+def probe_source(src: Path) -> dict:
+    """Return duration, size, fps and bitrate of src via ffprobe."""
     out = subprocess.check_output([
-        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "format=duration,bit_rate:"
+        "stream=width,height,r_frame_rate,bit_rate",
         "-of", "json", str(src)
     ])
     data = json.loads(out.decode() or "{}")
-    return float(data.get("format", {}).get("duration", 0.0))
+    fmt = data.get("format", {})
+    stream = (data.get("streams") or [{}])[0]
+    return {
+        "duration": _number(fmt.get("duration")),
+        "width": int(stream.get("width") or 0),
+        "height": int(stream.get("height") or 0),
+        "fps": _frame_rate(stream.get("r_frame_rate")),
+        "bitrate": int(_number(stream.get("bit_rate"))
+                       or _number(fmt.get("bit_rate"))),
+    }
+
+
+def _number(value) -> float:
+    """Return a probed number or 0.0 for missing values like 'N/A'."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _frame_rate(value: str | None) -> float:
+    """Return fps from a rational like '30000/1001'."""
+    num, _, den = (value or "0/1").partition("/")
+    return _number(num) / (_number(den or 1) or 1.0)
+
+
+def _rung_height(res: str) -> int:
+    """Return the height of a rung resolution like '1280x720'."""
+    return int(res.split("x")[1])
+
+
+def cap_rung(rung: tuple, bitrate: int) -> tuple:
+    """Lower a rung's bitrates to the source bitrate if it is lower."""
+    folder, res, vbr, peak, avg = rung
+    if not bitrate or bitrate >= avg:
+        return rung
+    return (folder, res, f"{bitrate // 1000}k",
+            int(peak * bitrate / avg), bitrate)
+
+
+def rung_level(res: str) -> str:
+    """Return the H.264 level for a rung resolution."""
+    height = _rung_height(res)
+    return next(level for min_h, level in RUNG_LEVELS if height >= min_h)
+
+
+def rung_codecs(res: str) -> str:
+    """Return the CODECS attribute of a rung (High profile, its level)."""
+    level = int(float(rung_level(res)) * 10)
+    return f"{CODECS_V.format(level=level)},{CODECS_A}"
+
+
+def build_ladder(meta: dict) -> list[tuple]:
+    """Return the LADDER rungs that do not upscale the source.
+
+    Rungs are capped at the source bitrate; lower rungs that would not
+    save bandwidth over a capped one are dropped, so BANDWIDTH stays
+    strictly decreasing down the ladder.
+    """
+    short = min(meta.get("width") or 0, meta.get("height") or 0)
+    if not short:
+        return list(LADDER)
+    rungs = [r for r in LADDER if _rung_height(r[1]) <= short] or LADDER[-1:]
+    ladder: list[tuple] = []
+    for rung in (cap_rung(r, meta.get("bitrate", 0)) for r in rungs):
+        if not ladder or (rung[3] < ladder[-1][3]
+                          and rung[4] < ladder[-1][4]):
+            ladder.append(rung)
+    return ladder
+
+
+def output_fps(fps: float) -> float:
+    """Return the encoded frame rate: the source's, capped at MAX_FPS."""
+    return min(fps, MAX_FPS) if fps > 0 else 0.0
+
+
+def single_pass_enabled() -> bool:
+    """Check whether the ladder is encoded from a single decode."""
+    return bool(getattr(settings, "VIDEO_SINGLE_PASS", False))
+
+
+def chunk_seconds() -> int:
+    """Return the chunk length for parallel encoding (0 disables it)."""
+    return int(getattr(settings, "VIDEO_CHUNK_SECONDS", 0) or 0)
+
+
+def chunk_workers() -> int:
+    """Return the number of chunks encoded concurrently."""
+    workers = getattr(settings, "VIDEO_CHUNK_WORKERS", 0) or os.cpu_count()
+    return max(1, int(workers or 1))
+
 
+def use_chunks(dur: float) -> bool:
+    """Check whether a source is long enough for chunked encoding."""
+    seconds = chunk_seconds()
+    return seconds > 0 and dur > seconds
 
-def transcode_variant(src: Path, out_dir: Path,
-                      size: str, vbr: str) -> None:
+
+def video_args(vbr: str, level: str = "4.0", fps: float = 0.0) -> list[str]:
+    """Return H.264 encoder arguments for one rung.
+
+    With a probed fps, sources above MAX_FPS are reduced to it (the
+    RUNG_LEVELS allow 30 fps) and the GOP spans one segment.
+    """
+    args = [
+        "-c:v", "libx264", "-profile:v", "high", "-level:v", level,
+        "-preset", "medium", "-crf", "20", "-b:v", vbr, "-maxrate", vbr,
+        "-bufsize", "2M", "-sc_threshold", "0",
+        "-force_key_frames", f"expr:gte(t,n_forced*{SEGMENT_SECONDS})",
+    ]
+    rate = output_fps(fps)
+    if rate:
+        args += ["-g", str(round(rate * SEGMENT_SECONDS))]
+    if fps > MAX_FPS:
+        args += ["-r", f"{MAX_FPS:g}"]
+    return args
+
+
+def audio_args() -> list[str]:
+    """Return AAC encoder arguments."""
+    return ["-c:a", "aac", "-ac", "2", "-b:a", "128k"]
+
+
+def hls_args(out_dir: Path, fmt: str = Video.SEGMENT_TS) -> list[str]:
+    """Return HLS muxer arguments writing into out_dir.
+
+    fMP4 rungs are written as one stream.m4s with a byte-range playlist.
+    """
+    if fmt == Video.SEGMENT_FMP4:
+        segments = ["-hls_segment_type", "fmp4",
+                    "-hls_flags", "independent_segments+single_file",
+                    "-hls_segment_filename", str(out_dir / "stream.m4s")]
+    else:
+        segments = ["-hls_flags", "independent_segments",
+                    "-hls_segment_filename", str(out_dir / "seg_%03d.ts")]
+    return ["-hls_time", str(SEGMENT_SECONDS), "-hls_playlist_type", "vod",
+            *segments, str(out_dir / "index.m3u8")]
+
+
+def transcode_variant(src: Path, out_dir: Path, size: str, vbr: str,
+                      fmt: str = Video.SEGMENT_TS, fps: float = 0.0) -> None:
     """Transcode one variant to HLS."""
     ensure_dirs([out_dir])
     _run([
-        "ffmpeg", "-y", "-i", str(src), "-c:v", "libx264", "-profile:v",
-        "high", "-level:v", "4.0", "-preset", "medium", "-crf", "20",
-        "-s:v", size, "-b:v", vbr, "-maxrate", vbr, "-bufsize", "2M",
-        "-sc_threshold", "0", "-force_key_frames", "expr:gte(t,n_forced*2)",
-        "-c:a", "aac", "-ac", "2", "-b:a", "128k", "-hls_time", "2",
-        "-hls_playlist_type", "vod", "-hls_flags", "independent_segments",
-        "-hls_segment_filename", str(out_dir / "seg_%03d.ts"),
-        str(out_dir / "index.m3u8"),
+        "ffmpeg", "-y", "-i", str(src), "-s:v", size,
+        *video_args(vbr, rung_level(size), fps), *audio_args(),
+        *hls_args(out_dir, fmt),
     ])
 
 
-def write_master_playlist(hls_dir: Path) -> None:
-    """Write master.m3u8 with CODECS and bandwidths."""
-    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
-    for f, res, _, peak, avg in LADDER:
+def split_filter(ladder: list[tuple],
+                 sprite_size: tuple[int, int] | None = None) -> str:
+    """Return a filter graph splitting one decode into scaled rungs.
+
+    With sprite_size, one more branch tiles trick-play thumbnails.
+    """
+    count = len(ladder) + bool(sprite_size)
+    pads = "".join(f"[s{i}]" for i in range(count))
+    scales = [f"[s{i}]scale={res.replace('x', ':')}[o{i}]"
+              for i, (_, res, *_) in enumerate(ladder)]
+    if sprite_size:
+        scales.append(f"[s{len(ladder)}]{sprite_filter(sprite_size)}[sprites]")
+    return ";".join([f"[0:v]split={count}{pads}", *scales])
+
+
+def transcode_single_pass(src: Path, hls: Path, ladder: list[tuple],
+                          fmt: str = Video.SEGMENT_TS,
+                          sprites: Path | None = None,
+                          sprite_size: tuple[int, int] | None = None,
+                          fps: float = 0.0) -> None:
+    """Transcode all rungs (and optionally sprites) from one decode."""
+    size = sprite_size if sprites else None
+    cmd = ["ffmpeg", "-y", "-i", str(src),
+           "-filter_complex", split_filter(ladder, size)]
+    for i, (folder, res, vbr, *_) in enumerate(ladder):
+        ensure_dirs([hls / folder])
+        cmd += ["-map", f"[o{i}]", "-map", "0:a?",
+                *video_args(vbr, rung_level(res), fps), *audio_args(),
+                *hls_args(hls / folder, fmt)]
+    if size:
+        shutil.rmtree(sprites, ignore_errors=True)
+        cmd += ["-map", "[sprites]", *sprite_args(sprites)]
+    _run(cmd)
+
+
+def sprite_interval() -> int:
+    """Return the seconds between trick-play thumbnails."""
+    return max(1, int(getattr(settings, "VIDEO_SPRITE_INTERVAL", 10)))
+
+
+def sprite_size(meta: dict) -> tuple[int, int]:
+    """Return the tile size keeping the source aspect ratio."""
+    width, height = meta.get("width") or 16, meta.get("height") or 9
+    return SPRITE_WIDTH, max(2, round(SPRITE_WIDTH * height / width / 2) * 2)
+
+
+def sprite_filter(size: tuple[int, int]) -> str:
+    """Return a filter sampling, scaling and tiling thumbnails."""
+    width, height = size
+    return (f"fps=1/{sprite_interval()},scale={width}:{height},"
+            f"tile={SPRITE_COLS}x{SPRITE_ROWS}")
+
+
+def sprite_args(out_dir: Path) -> list[str]:
+    """Return JPEG output arguments for sprite sheets in out_dir."""
+    ensure_dirs([out_dir])
+    return ["-q:v", "4", "-start_number", "0",
+            str(out_dir / "sprite_%03d.jpg")]
+
+
+def vtt_time(seconds: float) -> str:
+    """Format seconds as a WebVTT timestamp."""
+    minutes, sec = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{sec:06.3f}"
+
+
+def write_sprite_vtt(out_dir: Path, dur: float,
+                     size: tuple[int, int]) -> Path:
+    """Write the WebVTT map of thumbnail cues to sprite tiles."""
+    width, height = size
+    step, per_sheet = sprite_interval(), SPRITE_COLS * SPRITE_ROWS
+    lines = ["WEBVTT", ""]
+    for i in range(max(1, math.ceil(dur / step))):
+        sheet, slot = divmod(i, per_sheet)
+        x, y = slot % SPRITE_COLS * width, slot // SPRITE_COLS * height
+        end = min((i + 1) * step, dur) if dur else step
+        lines += [f"{vtt_time(i * step)} --> {vtt_time(end)}",
+                  f"sprite_{sheet:03d}.jpg#xywh={x},{y},{width},{height}",
+                  ""]
+    outp = out_dir / SPRITE_VTT
+    write_text_atomic(outp, "\n".join(lines))
+    return outp
+
+
+def make_sprites(src: Path, root: Path, dur: float, size: tuple[int, int],
+                 decoded: bool = False) -> Path:
+    """Publish sprite sheets and their WebVTT map under root/sprites.
+
+    Sheets already decoded with the ladder are reused from the temp dir.
+    """
+    tmp, outp = root / ".sprites.part", root / "sprites"
+    if not decoded:
+        shutil.rmtree(tmp, ignore_errors=True)
+        _run(["ffmpeg", "-y", "-i", str(src), "-an",
+              "-vf", sprite_filter(size), *sprite_args(tmp)])
+    ensure_dirs([tmp])
+    write_sprite_vtt(tmp, dur, size)
+    publish(tmp, outp)
+    return outp / SPRITE_VTT
+
+
+def write_master_playlist(hls_dir: Path, ladder: list[tuple],
+                          fmt: str = Video.SEGMENT_TS) -> None:
+    """Write master.m3u8 with per-rung CODECS and bandwidths."""
+    version = 7 if fmt == Video.SEGMENT_FMP4 else 3
+    lines = ["#EXTM3U", f"#EXT-X-VERSION:{version}",
+             "#EXT-X-INDEPENDENT-SEGMENTS"]
+    for f, res, _, peak, avg in ladder:
         info = (f"#EXT-X-STREAM-INF:BANDWIDTH={peak},"
                 f"AVERAGE-BANDWIDTH={avg},RESOLUTION={res},"
-                f"CODECS=\"{CODECS_V},{CODECS_A}\"")
+                f"CODECS=\"{rung_codecs(res)}\"")
         lines += [info, f"{f}/index.m3u8"]
-    (hls_dir / "master.m3u8").write_text("\n".join(lines) + "\n",
-                                         encoding="utf-8")
+    write_text_atomic(hls_dir / "master.m3u8", "\n".join(lines) + "\n")
+
+
+def split_source(src: Path, work: Path) -> list[Path]:
+    """Split the video stream of src at keyframes into chunks."""
+    ensure_dirs([work])
+    _run([
+        "ffmpeg", "-y", "-i", str(src), "-map", "0:v:0", "-c", "copy",
+        "-f", "segment", "-segment_time", str(chunk_seconds()),
+        "-reset_timestamps", "1", str(work / "src_%04d.mkv"),
+    ])
+    return sorted(work.glob("src_*.mkv"))
+
 
+def encode_chunk(chunk: Path, outp: Path, size: str, vbr: str,
+                 fps: float = 0.0) -> None:
+    """Encode the video of one chunk for one rung."""
+    _run(["ffmpeg", "-y", "-i", str(chunk), "-an", "-s:v", size,
+          *video_args(vbr, rung_level(size), fps), str(outp)])
+
+
+def write_concat_list(parts: list[Path], listing: Path) -> None:
+    """Write an ffmpeg concat demuxer list for encoded parts."""
+    lines = ["file '{}'".format(str(p).replace("'", "'\\''"))
+             for p in parts]
+    listing.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def package_variant(src: Path, listing: Path, out_dir: Path,
+                    fmt: str = Video.SEGMENT_TS) -> None:
+    """Stitch encoded parts with the source audio into one HLS rung."""
+    ensure_dirs([out_dir])
+    _run([
+        "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(listing),
+        "-i", str(src), "-map", "0:v", "-map", "1:a?", "-c:v", "copy",
+        *audio_args(), *hls_args(out_dir, fmt),
+    ])
 
-def transcode_ladder(src: Path, root: Path) -> None:
-    """Make hls/{v0..v3} and a master.m3u8."""
+
+def transcode_chunked(src: Path, hls: Path, work: Path, ladder: list[tuple],
+                      fmt: str = Video.SEGMENT_TS, fps: float = 0.0) -> None:
+    """Transcode all rungs from chunks encoded in parallel."""
+    chunks = split_source(src, work)
+    parts = {folder: [work / f"{folder}_{c.stem}.mp4" for c in chunks]
+             for folder, *_ in ladder}
+    jobs = [(c, outp, res, vbr, fps) for folder, res, vbr, *_ in ladder
+            for c, outp in zip(chunks, parts[folder])]
+    with ThreadPoolExecutor(max_workers=chunk_workers()) as pool:
+        list(pool.map(lambda job: encode_chunk(*job), jobs))
+    for folder, *_ in ladder:
+        listing = work / f"{folder}.txt"
+        write_concat_list(parts[folder], listing)
+        package_variant(src, listing, hls / folder, fmt)
+    shutil.rmtree(work, ignore_errors=True)
+
+
+def rung_done(checkpoint: Checkpoint | None, hls: Path, folder: str,
+              fmt: str = Video.SEGMENT_TS) -> bool:
+    """Check a rung for a recorded and still valid playlist of fmt."""
+    if not checkpoint:
+        return False
+    recorded = checkpoint.get(f"rung:{folder}")
+    same_format = recorded == fmt or (recorded is True
+                                      and fmt == Video.SEGMENT_TS)
+    return same_format and checkpoint.done(
+        f"rung:{folder}", hls / folder / "index.m3u8")
+
+
+def publish_rung(staging: Path, hls: Path, folder: str,
+                 checkpoint: Checkpoint | None,
+                 fmt: str = Video.SEGMENT_TS) -> None:
+    """Move a finished rung from staging into place and record it."""
+    publish(staging / folder, hls / folder)
+    if checkpoint:
+        checkpoint.mark(f"rung:{folder}", fmt)
+
+
+def transcode_ladder(src: Path, root: Path, ladder: list[tuple],
+                     dur: float = 0.0,
+                     checkpoint: Checkpoint | None = None,
+                     fmt: str = Video.SEGMENT_TS,
+                     sprite_size: tuple[int, int] | None = None,
+                     fps: float = 0.0) -> bool:
+    """Make hls/<rung> for every ladder rung and a master.m3u8.
+
+    Returns whether sprite sheets were decoded along with the rungs
+    (single-pass only) into root/.sprites.part.
+    """
     hls = root / "hls"
-    ensure_dirs([hls])
-    for folder, res, vbr, *_ in LADDER:
-        transcode_variant(src, hls / folder, res, vbr)
-    write_master_playlist(hls)
+    staging = hls / ".staging"
+    pending = [r for r in ladder
+               if not rung_done(checkpoint, hls, r[0], fmt)]
+    shutil.rmtree(staging, ignore_errors=True)
+    ensure_dirs([staging])
+    sprites = False
+    if pending and use_chunks(dur):
+        transcode_chunked(src, staging, root / "chunks", pending, fmt, fps)
+    elif pending and single_pass_enabled():
+        sprites = bool(sprite_size)
+        transcode_single_pass(src, staging, pending, fmt,
+                              root / ".sprites.part", sprite_size, fps)
+    for folder, res, vbr, *_ in pending:
+        if not (staging / folder).exists():
+            transcode_variant(src, staging / folder, res, vbr, fmt, fps)
+        publish_rung(staging, hls, folder, checkpoint, fmt)
+    shutil.rmtree(staging, ignore_errors=True)
+    write_master_playlist(hls, ladder, fmt)
+    return sprites
+
+
+def publish_output(tmp: Path, outp: Path) -> Path | None:
+    """Publish an ffmpeg output; None if ffmpeg wrote nothing."""
+    if not is_valid_output(tmp):
+        logger.warning("ffmpeg wrote no %s; skipping it.", outp)
+        return None
+    publish(tmp, outp)
+    return outp
 
 
-def make_preview(src: Path, root: Path) -> Path:
+def make_preview(src: Path, root: Path) -> Path | None:
     """Create a short MP4 preview clip."""
     outp = root / "previews" / "preview.mp4"
+    tmp = outp.with_name(".preview.part.mp4")
     ensure_dirs([outp.parent])
     _run(["ffmpeg", "-y", "-ss", "0", "-t", "10", "-i", str(src),
-          "-c:v", "libx264", "-c:a", "aac", str(outp)])
-    return outp
+          "-c:v", "libx264", "-c:a", "aac", str(tmp)])
+    return publish_output(tmp, outp)
+
+
+def thumbnail_offset(dur: float) -> float:
+    """Return the thumbnail seek, kept inside sources shorter than 10 s."""
+    return min(THUMBNAIL_OFFSET, max(dur, 0.0) / 2)
 
 
-def make_thumbnail(src: Path, root: Path) -> Path:
+def make_thumbnail(src: Path, root: Path, dur: float) -> Path | None:
     """Create a JPG thumbnail."""
     outp = root / "thumbs" / "thumb.jpg"
+    tmp = outp.with_name(".thumb.part.jpg")
     ensure_dirs([outp.parent])
-    _run(["ffmpeg", "-y", "-ss", "5", "-i", str(src),
-          "-frames:v", "1", "-q:v", "2", str(outp)])
-    return outp
+    _run(["ffmpeg", "-y", "-ss", f"{thumbnail_offset(dur):.3f}",
+          "-i", str(src), "-frames:v", "1", "-q:v", "2", str(tmp)])
+    return publish_output(tmp, outp)
+
 
+def update_video_record(video: Video, name: str, dur: float,
+                        ladder: list[tuple], root: Path) -> None:
+    """Persist derived fields for a processed video.
 
-def update_video_record(video: Video, name: str, dur: float) -> None:
-    """Persist derived fields for a processed video."""
+    Optional assets are only set if they were produced under root.
+    """
     video.duration = dur
     video.hls_playlist.name = f"videos/{name}/hls/master.m3u8"
-    video.quality_levels = quality_payload(name)
-    video.preview.name = f"videos/{name}/previews/preview.mp4"
-    video.thumbnail.name = f"videos/{name}/thumbs/thumb.jpg"
+    video.quality_levels = quality_payload(name, ladder)
+    fields = ["duration", "hls_playlist", "quality_levels", "updated_at"]
+    for field, rel in OPTIONAL_ASSETS.items():
+        if is_valid_output(root / rel):
+            getattr(video, field).name = f"videos/{name}/{rel}"
+            fields.append(field)
+    video.save(update_fields=fields)
+
+
+def store_content_hash(video: Video, digest: str) -> None:
+    """Persist the source hash without re-triggering processing."""
+    if video.content_hash != digest:
+        Video.objects.filter(pk=video.pk).update(content_hash=digest)
+        video.content_hash = digest
+
+
+def find_processed_twin(video: Video) -> Video | None:
+    """Return another processed video with the same source hash."""
+    if not video.content_hash:
+        return None
+    return (Video.objects.exclude(pk=video.pk)
+            .filter(content_hash=video.content_hash,
+                    segment_format=video.segment_format)
+            .exclude(hls_playlist="").exclude(hls_playlist__isnull=True)
+            .order_by("created_at").first())
+
+
+def reuse_twin_assets(video: Video, twin: Video) -> None:
+    """Point a video at the HLS tree, preview and thumbnail of its twin."""
+    video.duration = twin.duration
+    video.hls_playlist.name = twin.hls_playlist.name
+    video.quality_levels = twin.quality_levels
+    video.preview.name = twin.preview.name
+    video.thumbnail.name = twin.thumbnail.name
+    video.sprites_vtt.name = twin.sprites_vtt.name
     video.save(update_fields=[
-        "duration", "hls_playlist", "quality_levels", "preview", "thumbnail"
+        "duration", "hls_playlist", "quality_levels", "preview", "thumbnail",
+        "sprites_vtt", "updated_at",
     ])
 
 
-def process_video(video_id: int) -> None:
-    """Orchestrate processing and update model fields."""
-    video = Video.objects.get(id=video_id)
-    if not video.video_file:
-        return
+def source_paths(video: Video) -> tuple[Path, str, Path]:
+    """Return the source file, asset name and asset root of a video."""
     src = MEDIA_ROOT / str(video.video_file)
     name = video_name_from_path(src.name)
     root = MEDIA_ROOT / "videos" / name
     ensure_dirs([root])
-    dur = probe_duration(src)
-    transcode_ladder(src, root)
-    make_preview(src, root)
-    make_thumbnail(src, root)
-    with transaction.atomic():
-        update_video_record(video, name, dur)
+    return src, name, root
+
+
+def reuse_twin(video: Video, src: Path, cp: Checkpoint) -> bool:
+    """Hash the source and reuse the assets of a processed twin."""
+    store_content_hash(video, cp.get("hash") or cp.mark(
+        "hash", file_sha256(src)))
+    twin = find_processed_twin(video)
+    if twin:
+        reuse_twin_assets(video, twin)
+    return bool(twin)
+
+
+def transcode_timeout(dur: float) -> int:
+    """Return the process_video job timeout for a source duration.
+
+    Sources that were never probed get VIDEO_TIMEOUT_DEFAULT.
+    """
+    if not dur:
+        return int(getattr(settings, "VIDEO_TIMEOUT_DEFAULT", 14400))
+    base = int(getattr(settings, "VIDEO_TIMEOUT_BASE", 600))
+    factor = float(getattr(settings, "VIDEO_TIMEOUT_FACTOR", 4))
+    return base + int(dur * factor)
+
+
+def enqueue_transcode(video_id: int):
+    """
+    Enqueue the transcode of a video from the light queue.
+
+    Only reads the stored duration, so the light queue is never held up
+    by reading a large source; hashing and probing run in process_video.
+    """
+    video = Video.objects.filter(id=video_id).only(
+        "video_file", "duration").first()
+    if not video or not video.video_file:
+        return None
+    return django_rq.get_queue("transcode").enqueue(
+        process_video, video_id,
+        job_timeout=transcode_timeout(video.duration or 0.0))
+
+
+def process_video(video_id: int) -> None:
+    """Orchestrate processing and update model fields.
+
+    Finished stages are recorded in a checkpoint, so a retried job only
+    runs the stages whose outputs are missing. Sources whose content hash
+    matches an already processed video reuse that video's assets.
+    """
+    video = Video.objects.get(id=video_id)
+    if not video.video_file:
+        return
+    src, name, root = source_paths(video)
+    cp = Checkpoint(root, src)
+    if reuse_twin(video, src, cp):
+        return
+    meta = cp.get("probe")
+    if meta is None:
+        with stage_timer("probe"):
+            meta = cp.mark("probe", probe_source(src))
+    dur, ladder = meta["duration"], build_ladder(meta)
+    size = sprite_size(meta)
+    want_sprites = not cp.done("sprites", root / "sprites" / SPRITE_VTT)
+    with stage_timer("ladder"):
+        decoded = transcode_ladder(src, root, ladder, dur, cp,
+                                   video.segment_format,
+                                   size if want_sprites else None,
+                                   meta.get("fps", 0.0))
+    if want_sprites:
+        with stage_timer("sprites"):
+            vtt = make_sprites(src, root, dur, size, decoded)
+        cp.mark("sprites", str(vtt))
+    if not cp.done("preview", root / "previews" / "preview.mp4"):
+        with stage_timer("preview"):
+            preview = make_preview(src, root)
+        if preview:
+            cp.mark("preview", str(preview))
+    if not cp.done("thumbnail", root / "thumbs" / "thumb.jpg"):
+        with stage_timer("thumbnail"):
+            thumb = make_thumbnail(src, root, dur)
+        if thumb:
+            cp.mark("thumbnail", str(thumb))
+    if not (cp.done("record") and video.hls_playlist):
+        with stage_timer("record"), transaction.atomic():
+            update_video_record(video, name, dur, ladder, root)
+        cp.mark("record")
@@ -0,0 +1,104 @@
+# Standard libraries
+import json
+
+# Third-party suppliers
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, AsyncRequestFactory
+from django.urls import path
+from knox.models import AuthToken
+from rest_framework.test import APIRequestFactory
+
+# Local imports
+from .utils.factories import make_video
+from auth_app.tests.utils.factories import make_user
+from video_app.api.views import (
+    AsyncVideoDetailView,
+    AsyncVideoListView,
+    VideoDetailView,
+    VideoListView
+)
+from video_progress_app.models import VideoProgress
+
+
+pytestmark = pytest.mark.django_db
+
+urlpatterns = [
+    path("videos/", AsyncVideoListView.as_view()),
+    path("videos/<int:pk>/", AsyncVideoDetailView.as_view()),
+]
+
+
+@pytest.fixture
+def auth():
+    """Get a user with progress on one of two videos and its token header."""
+    user = make_user(email="user@mail.com", is_active=True)
+    wolf = make_video(title="Wolf", genre="Nature", duration=100.0)
+    make_video(title="Storm", genre="Drama", duration=100.0)
+    VideoProgress.objects.create(user=user, video=wolf, last_position=25.0,
+                                 relative_position=25.0)
+    _, token = AuthToken.objects.create(user=user)
+    return wolf, {"Authorization": f"Token {token}"}
+
+
+def _sync(view, path: str, headers: dict, **kwargs):
+    """Call a sync APIView and return the rendered response."""
+    request = APIRequestFactory().get(path, headers=headers)
+    return view.as_view()(request, **kwargs).render()
+
+
+def _async(view, path: str, headers: dict, **kwargs):
+    """Call an async view and return its response."""
+    request = AsyncRequestFactory().get(path, headers=headers)
+    return async_to_sync(view.as_view())(request, **kwargs)
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_async_list_matches_sync_list(auth, settings, cached):
+    """Test for the same list payload and ETag from both views."""
+    settings.VIDEO_CATALOG_CACHE = cached
+    _, headers = auth
+    sync = _sync(VideoListView, "/api/videos/", headers)
+    res = _async(AsyncVideoListView, "/api/videos/", headers)
+    assert res.status_code == 200
+    assert json.loads(res.content) == json.loads(sync.content)
+    assert res["ETag"] == sync["ETag"]
+
+
+def test_async_detail_matches_sync_detail(auth):
+    """Test for the same detail payload and a 304 on a matching ETag."""
+    wolf, headers = auth
+    path = f"/api/videos/{wolf.pk}/"
+    sync = _sync(VideoDetailView, path, headers, pk=wolf.pk)
+    res = _async(AsyncVideoDetailView, path, headers, pk=wolf.pk)
+    assert json.loads(res.content) == json.loads(sync.content)
+    again = _async(AsyncVideoDetailView, path,
+                   {**headers, "If-None-Match": res["ETag"]}, pk=wolf.pk)
+    assert again.status_code == 304
+
+
+def test_async_detail_not_found(auth):
+    """Test for 404 on an unknown video."""
+    _, headers = auth
+    res = _async(AsyncVideoDetailView, "/api/videos/999/", headers, pk=999)
+    assert res.status_code == 404
+
+
+@pytest.mark.parametrize("header", [{}, {"Authorization": "Token bad"}])
+def test_async_list_requires_valid_token(db, header):
+    """Test for 401 without or with an invalid token."""
+    res = _async(AsyncVideoListView, "/api/videos/", header)
+    assert res.status_code == 401
+    assert res["WWW-Authenticate"] == "Token"
+
+
+@pytest.mark.urls("video_app.tests.test_async_views")
+def test_async_list_through_asgi_stack(auth, settings):
+    """Test for serving the async list through the async middleware."""
+    settings.QUERY_DEBUG_HEADERS = True
+    _, headers = auth
+    res = async_to_sync(AsyncClient().get)("/videos/", headers=headers)
+    assert res.status_code == 200
+    assert [s["genre"] for s in res.json()][:2] == ["New on Videoflix",
+                                                    "Started videos"]
+    assert int(res["X-DB-Queries"]) > 0
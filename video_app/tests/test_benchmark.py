@@ -0,0 +1,52 @@
+# Standard libraries
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+# Third-party suppliers
+import pytest
+
+# Local imports
+from video_app import benchmark, tasks
+
+
+needs_proc = pytest.mark.skipif(not Path("/proc/self/status").exists(),
+                                reason="peak RSS is read from /proc")
+
+
+def test_case_lists_are_parsed():
+    """Test for parsing resolution and duration lists."""
+    assert benchmark.parse_sizes("640x360,1280X720") == [(640, 360),
+                                                         (1280, 720)]
+    assert benchmark.parse_durations("10,60,") == [10, 60]
+
+
+@needs_proc
+def test_timed_measures_task_commands():
+    """Test for counting the commands a stage runs via tasks._run."""
+    original = tasks._run
+    stats, _ = benchmark.timed(lambda: tasks._run(
+        [sys.executable, "-c",
+         "import time; b = bytearray(32 << 20); time.sleep(0.2)"]))
+    assert stats["commands"] == 1
+    assert stats["peak_rss_mb"] >= 32
+    assert tasks._run is original
+
+
+@needs_proc
+def test_child_peak_rss_excludes_parent():
+    """Test for a trivial child reporting far less memory than the parent."""
+    runs: list[dict] = []
+    benchmark.run_measured(["true"], runs)
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert runs[0]["rss"] < own / 4
+
+
+def test_failed_command_raises_and_restores_runner():
+    """Test for failing stages raising like tasks._run does."""
+    original = tasks._run
+    with pytest.raises(subprocess.CalledProcessError):
+        benchmark.timed(
+            lambda: tasks._run([sys.executable, "-c", "exit(3)"]))
+    assert tasks._run is original
@@ -0,0 +1,104 @@
+# Third-party suppliers
+import pytest
+from rest_framework.test import APIRequestFactory
+
+# Local imports
+from video_app.api.views import MediaView
+
+
+pytestmark = pytest.mark.django_db
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    """Use a temp MEDIA_ROOT with a preview, a segment and a playlist."""
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_SERVE_MODE = "stream"
+    hls = tmp_path / "hls" / "wolf" / "480p"
+    hls.mkdir(parents=True)
+    (tmp_path / "preview.mp4").write_bytes(DATA)
+    (hls / "segment_000.ts").write_bytes(DATA)
+    (hls / "index.m3u8").write_text("#EXTM3U\n")
+    (tmp_path / "hls" / "wolf" / ".checkpoint.json").write_text("{}")
+    return tmp_path
+
+
+def _get(path: str, **headers):
+    """Call the media view for path."""
+    request = APIRequestFactory().get(f"/media/{path}", **headers)
+    return MediaView.as_view()(request, path=path)
+
+
+def _body(res) -> bytes:
+    """Return the streamed body of a response."""
+    return b"".join(res.streaming_content)
+
+
+def test_full_file_is_streamed(media):
+    """Test for streaming a whole file with its length."""
+    res = _get("preview.mp4")
+    assert res.status_code == 200
+    assert res["Content-Length"] == str(len(DATA))
+    assert res["Accept-Ranges"] == "bytes"
+    assert _body(res) == DATA
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=10-19", 10, 19),
+    ("bytes=1000-", 1000, 1023),
+    ("bytes=-4", 1020, 1023),
+    ("bytes=1000-5000", 1000, 1023),
+])
+def test_byte_range_is_served(media, header, start, end):
+    """Test for partial content of a single byte range."""
+    res = _get("preview.mp4", HTTP_RANGE=header)
+    assert res.status_code == 206
+    assert res["Content-Range"] == f"bytes {start}-{end}/{len(DATA)}"
+    assert res["Content-Length"] == str(end - start + 1)
+    assert _body(res) == DATA[start:end + 1]
+
+
+def test_unsatisfiable_range(media):
+    """Test for 416 on a range beyond the file."""
+    res = _get("preview.mp4", HTTP_RANGE="bytes=5000-")
+    assert res.status_code == 416
+    assert res["Content-Range"] == f"bytes */{len(DATA)}"
+
+
+def test_cache_headers_by_kind(media):
+    """Test for immutable segments and revalidated playlists."""
+    segment = _get("hls/wolf/480p/segment_000.ts")
+    assert "immutable" in segment["Cache-Control"]
+    assert segment["Content-Type"] == "video/mp2t"
+    playlist = _get("hls/wolf/480p/index.m3u8")
+    assert "no-cache" in playlist["Cache-Control"]
+
+
+@pytest.mark.parametrize("path", [
+    "missing.mp4", "../etc/passwd", "hls/wolf/.checkpoint.json", "hls",
+])
+def test_unknown_or_hidden_paths_not_found(media, path):
+    """Test for 404 on missing, hidden, directory or escaping paths."""
+    assert _get(path).status_code == 404
+
+
+@pytest.mark.parametrize("mode, header, value", [
+    ("accel", "X-Accel-Redirect", "/protected-media/preview.mp4"),
+    ("sendfile", "X-Sendfile", "preview.mp4"),
+])
+def test_proxy_hand_off(media, settings, mode, header, value):
+    """Test for empty responses handing the file to the proxy."""
+    settings.MEDIA_SERVE_MODE = mode
+    res = _get("preview.mp4")
+    assert res.status_code == 200
+    assert res[header].endswith(value)
+    assert res.content == b""
+    assert res["Content-Type"] == "video/mp4"
+
+
+def test_protected_media_requires_token(media, settings):
+    """Test for rejecting anonymous requests when media is protected."""
+    settings.MEDIA_REQUIRE_AUTH = True
+    assert _get("preview.mp4").status_code == 401
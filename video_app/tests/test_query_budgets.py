@@ -0,0 +1,74 @@
+# Third-party suppliers
+import pytest
+from django.urls import reverse
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from .utils.factories import make_video
+from auth_app.tests.utils.factories import make_user
+from video_progress_app.models import VideoProgress
+
+
+# Budgets include the token and user lookups of a cold token cache
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def api_client(db) -> APIClient:
+    """Get APIClient of a user with a knox token."""
+    user = make_user(email="user@mail.com", is_active=True)
+    _, token = AuthToken.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    client.user = user
+    return client
+
+
+def _catalog(user, count: int) -> list:
+    """Make count videos over two genres, half of them started by user."""
+    videos = [make_video(title=f"V{i}", genre=("Drama", "Nature")[i % 2],
+                         duration=100.0) for i in range(count)]
+    for video in videos[::2]:
+        VideoProgress.objects.create(user=user, video=video,
+                                     last_position=10.0)
+    return videos
+
+
+@pytest.mark.parametrize("count", [1, 12])
+@pytest.mark.parametrize("cached", [True, False])
+def test_list_budget(api_client, query_budget, settings, count, cached):
+    """Test for a constant query count of the video list."""
+    settings.VIDEO_CATALOG_CACHE = cached
+    _catalog(api_client.user, count)
+    with query_budget(AUTH_QUERIES + (2 if cached else 1)):
+        res = api_client.get(reverse("video_app:video-list"))
+    assert res.status_code == 200
+
+
+@pytest.mark.parametrize("count", [1, 12])
+def test_detail_budget(api_client, query_budget, count):
+    """Test for a constant query count of the video detail."""
+    video = _catalog(api_client.user, count)[0]
+    url = reverse("video_app:video-detail", kwargs={"pk": video.pk})
+    with query_budget(AUTH_QUERIES + 2):
+        assert api_client.get(url).status_code == 200
+
+
+@pytest.mark.parametrize("count", [1, 12])
+def test_sections_budget(api_client, query_budget, count):
+    """Test for a constant query count of the section index."""
+    _catalog(api_client.user, count)
+    with query_budget(AUTH_QUERIES + 3):
+        res = api_client.get(reverse("video_app:video-sections"))
+    assert res.status_code == 200
+
+
+@pytest.mark.parametrize("count", [1, 12])
+def test_section_page_budget(api_client, query_budget, count):
+    """Test for a constant query count of a section page."""
+    _catalog(api_client.user, count)
+    with query_budget(AUTH_QUERIES + 1):
+        res = api_client.get(reverse("video_app:video-section-page"),
+                             {"genre": "Drama"})
+    assert res.status_code == 200
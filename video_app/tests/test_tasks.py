@@ -0,0 +1,338 @@
+# Standard libraries
+import shutil
+from pathlib import Path
+
+# Third-party suppliers
+import pytest
+
+# Local imports
+from video_app import benchmark, tasks
+from video_app.checkpoints import Checkpoint
+from video_app.models import Video
+from video_app.tests.utils.factories import make_video
+from video_app.utils import file_sha256
+
+
+@pytest.fixture
+def commands(monkeypatch) -> list[list[str]]:
+    """Collect ffmpeg commands instead of running them."""
+    calls: list[list[str]] = []
+    monkeypatch.setattr(tasks, "_run", calls.append)
+    return calls
+
+
+def test_ladder_per_variant(commands, tmp_path, settings):
+    """Test for one ffmpeg run per ladder rung."""
+    settings.VIDEO_SINGLE_PASS = False
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, tasks.LADDER)
+    assert len(commands) == len(tasks.LADDER)
+    assert (tmp_path / "hls" / "master.m3u8").exists()
+
+
+def test_ladder_single_pass(commands, tmp_path, settings):
+    """Test for a single ffmpeg run feeding every ladder rung."""
+    settings.VIDEO_SINGLE_PASS = True
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, tasks.LADDER)
+    cmd = commands[0]
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert len(commands) == 1 and cmd.count("-i") == 1
+    assert graph.startswith(f"[0:v]split={len(tasks.LADDER)}")
+    for folder, res, vbr, *_ in tasks.LADDER:
+        assert any(a.endswith(f"{folder}/index.m3u8") for a in cmd)
+        assert (tmp_path / "hls" / folder).is_dir()
+        assert res.replace("x", ":") in graph and vbr in cmd
+
+
+def test_ladder_chunked(commands, tmp_path, settings, monkeypatch):
+    """Test for parallel chunk encoding stitched into each rung."""
+    settings.VIDEO_CHUNK_SECONDS = 60
+    chunks = [tmp_path / "src_0000.mkv", tmp_path / "src_0001.mkv"]
+
+    def fake_split(src, work):
+        work.mkdir(parents=True)
+        return chunks
+    monkeypatch.setattr(tasks, "split_source", fake_split)
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, tasks.LADDER,
+                           dur=120.0)
+    packaged = [c for c in commands if "concat" in c]
+    assert len(commands) == len(tasks.LADDER) * (len(chunks) + 1)
+    assert len(packaged) == len(tasks.LADDER)
+    assert not (tmp_path / "chunks").exists()
+    assert not (tmp_path / "hls" / ".staging").exists()
+
+
+def test_ladder_short_source_skips_chunks(commands, tmp_path, settings):
+    """Test for sources shorter than one chunk using the regular path."""
+    settings.VIDEO_CHUNK_SECONDS = 60
+    settings.VIDEO_SINGLE_PASS = False
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, tasks.LADDER,
+                           dur=30.0)
+    assert len(commands) == len(tasks.LADDER)
+    assert not any("concat" in c for c in commands)
+
+
+def test_build_ladder_skips_upscaled_rungs():
+    """Test for a 480p source producing only rungs up to its height."""
+    ladder = tasks.build_ladder({"width": 854, "height": 480})
+    assert [r[0] for r in ladder] == ["v2", "v3"]
+
+
+def test_build_ladder_caps_bitrate():
+    """Test for rung bitrates limited to a low-bitrate source."""
+    ladder = tasks.build_ladder({"width": 640, "height": 360,
+                                 "bitrate": 500000})
+    assert ladder[0][2:] == ("500k", 600000, 500000)
+    assert ladder[1] == tasks.LADDER[-1]
+
+
+def test_build_ladder_collapses_rungs_of_low_bitrate_source():
+    """Test for one rung when capping leaves no cheaper lower rung."""
+    ladder = tasks.build_ladder({"width": 640, "height": 360,
+                                 "bitrate": 100000})
+    assert ladder == [("v2", "640x360", "100k", 120000, 100000)]
+
+
+@pytest.mark.parametrize("bitrate", range(100000, 6000001, 70000))
+def test_build_ladder_bandwidth_strictly_decreases(bitrate):
+    """Test for advertised bandwidths following rung quality."""
+    ladder = tasks.build_ladder({"width": 1920, "height": 1080,
+                                 "bitrate": bitrate})
+    for higher, lower in zip(ladder, ladder[1:]):
+        assert higher[3] > lower[3] and higher[4] > lower[4]
+
+
+def test_video_args_follow_source_fps():
+    """Test for a segment-long GOP and frame rates capped at 30 fps."""
+    args = tasks.video_args("800k", "3.0", 25.0)
+    assert args[args.index("-g") + 1] == "50" and "-r" not in args
+    args = tasks.video_args("800k", "3.0", 59.94)
+    assert args[args.index("-g") + 1] == "60"
+    assert args[args.index("-r") + 1] == "30"
+    assert "-g" not in tasks.video_args("800k")
+
+
+def test_build_ladder_keeps_smallest_rung():
+    """Test for tiny sources still getting the lowest rung."""
+    ladder = tasks.build_ladder({"width": 160, "height": 90})
+    assert ladder == tasks.LADDER[-1:]
+
+
+def test_probe_source(monkeypatch, tmp_path):
+    """Test for parsing ffprobe stream metadata."""
+    out = (b'{"streams": [{"width": 1280, "height": 720, '
+           b'"r_frame_rate": "30000/1001", "bit_rate": "N/A"}], '
+           b'"format": {"duration": "12.5", "bit_rate": "900000"}}')
+    monkeypatch.setattr(tasks.subprocess, "check_output", lambda c: out)
+    meta = tasks.probe_source(tmp_path / "src.mp4")
+    assert meta["duration"] == 12.5 and meta["bitrate"] == 900000
+    assert (meta["width"], meta["height"]) == (1280, 720)
+    assert round(meta["fps"], 2) == 29.97
+
+
+def test_master_playlist_lists_produced_rungs(commands, tmp_path, settings):
+    """Test for master and quality levels advertising produced rungs."""
+    settings.VIDEO_SINGLE_PASS = False
+    ladder = tasks.build_ladder({"width": 1280, "height": 720})
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, ladder)
+    master = (tmp_path / "hls" / "master.m3u8").read_text()
+    labels = [q["label"] for q in tasks.quality_payload("wolf", ladder)]
+    assert "v0/index.m3u8" not in master and "v1/index.m3u8" in master
+    assert labels == ["720p", "360p", "144p"]
+
+
+@pytest.fixture
+def encoder(monkeypatch) -> list[list[str]]:
+    """Fake ffmpeg runs that write the playlist they were asked for."""
+    calls: list[list[str]] = []
+
+    def fake_run(cmd):
+        calls.append(cmd)
+        Path(cmd[-1]).write_text("#EXTM3U\n#EXT-X-ENDLIST\n")
+    monkeypatch.setattr(tasks, "_run", fake_run)
+    return calls
+
+
+def test_ladder_resumes_from_checkpoint(encoder, tmp_path, settings):
+    """Test for a retry re-encoding only rungs without valid output."""
+    settings.VIDEO_SINGLE_PASS = False
+    src = tmp_path / "src.mp4"
+    src.write_bytes(b"source")
+    tasks.transcode_ladder(src, tmp_path, tasks.LADDER, 0.0,
+                           Checkpoint(tmp_path, src))
+    (tmp_path / "hls" / "v1" / "index.m3u8").unlink()
+    encoder.clear()
+    tasks.transcode_ladder(src, tmp_path, tasks.LADDER, 0.0,
+                           Checkpoint(tmp_path, src))
+    assert len(encoder) == 1 and "/v1/index.m3u8" in encoder[0][-1]
+    assert (tmp_path / "hls" / "v1" / "index.m3u8").exists()
+
+
+def test_checkpoint_invalidated_by_new_source(tmp_path):
+    """Test for a changed source discarding recorded stages."""
+    src = tmp_path / "src.mp4"
+    src.write_bytes(b"source")
+    Checkpoint(tmp_path, src).mark("probe", {"duration": 1.0})
+    src.write_bytes(b"another source")
+    assert Checkpoint(tmp_path, src).get("probe") is None
+
+
+@pytest.mark.django_db
+def test_process_video_reuses_duplicate_upload(tmp_path, monkeypatch):
+    """Test for a re-uploaded source reusing the processed twin's assets."""
+    src = tmp_path / "videos" / "originals" / "copy.mp4"
+    src.parent.mkdir(parents=True)
+    src.write_bytes(b"same master file")
+    twin = make_video(title="Original", duration=42.0,
+                      content_hash=file_sha256(src),
+                      hls_playlist="videos/original/hls/master.m3u8",
+                      preview="videos/original/previews/preview.mp4")
+    video = make_video(title="Copy")
+    Video.objects.filter(pk=video.pk).update(video_file=str(
+        src.relative_to(tmp_path)))
+    monkeypatch.setattr(tasks, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(tasks, "_run", pytest.fail)
+    tasks.process_video(video.pk)
+    video.refresh_from_db()
+    assert video.content_hash == twin.content_hash
+    assert video.hls_playlist.name == twin.hls_playlist.name
+    assert video.duration == 42.0
+
+
+def test_fmp4_ladder_writes_single_file_rungs(commands, tmp_path, settings):
+    """Test for fMP4 byte-range rungs and a version 7 master."""
+    settings.VIDEO_SINGLE_PASS = False
+    tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path, tasks.LADDER,
+                           fmt=Video.SEGMENT_FMP4)
+    assert all("fmp4" in cmd and "independent_segments+single_file" in cmd
+               for cmd in commands)
+    assert commands[0][commands[0].index("-hls_segment_filename") + 1] \
+        .endswith("v0/stream.m4s")
+    master = (tmp_path / "hls" / "master.m3u8").read_text()
+    assert "#EXT-X-VERSION:7" in master
+
+
+def test_master_playlist_codecs_per_rung(tmp_path):
+    """Test for CODECS matching the level each rung is encoded with."""
+    tasks.write_master_playlist(tmp_path, tasks.LADDER)
+    master = (tmp_path / "master.m3u8").read_text()
+    assert "#EXT-X-VERSION:3" in master
+    for codecs in ("avc1.640028", "avc1.64001f", "avc1.64001e",
+                   "avc1.640015"):
+        assert f'CODECS="{codecs},mp4a.40.2"' in master
+    assert tasks.video_args("800k", tasks.rung_level("640x360"))[5] == "3.0"
+
+
+def test_format_change_reencodes_rungs(encoder, tmp_path, settings):
+    """Test for TS rungs in the checkpoint not satisfying an fMP4 run."""
+    settings.VIDEO_SINGLE_PASS = False
+    src = tmp_path / "src.mp4"
+    src.write_bytes(b"source")
+    tasks.transcode_ladder(src, tmp_path, tasks.LADDER, 0.0,
+                           Checkpoint(tmp_path, src))
+    encoder.clear()
+    tasks.transcode_ladder(src, tmp_path, tasks.LADDER, 0.0,
+                           Checkpoint(tmp_path, src), Video.SEGMENT_FMP4)
+    assert len(encoder) == len(tasks.LADDER)
+
+
+def test_single_pass_decodes_sprites(commands, tmp_path, settings):
+    """Test for sprite sheets tiled from the ladder's decode."""
+    settings.VIDEO_SINGLE_PASS = True
+    settings.VIDEO_SPRITE_INTERVAL = 10
+    decoded = tasks.transcode_ladder(tmp_path / "src.mp4", tmp_path,
+                                     tasks.LADDER, sprite_size=(160, 90))
+    cmd = commands[0]
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert decoded and len(commands) == 1
+    assert graph.startswith(f"[0:v]split={len(tasks.LADDER) + 1}")
+    assert "fps=1/10,scale=160:90,tile=5x5[sprites]" in graph
+    assert cmd[-1].endswith(".sprites.part/sprite_%03d.jpg")
+
+
+def test_make_sprites_writes_vtt_map(commands, tmp_path, settings):
+    """Test for WebVTT cues pointing at tiles across sheets."""
+    settings.VIDEO_SPRITE_INTERVAL = 10
+    vtt = tasks.make_sprites(tmp_path / "src.mp4", tmp_path, 255.0,
+                             (160, 90))
+    text = vtt.read_text()
+    assert vtt == tmp_path / "sprites" / "sprites.vtt"
+    assert len(commands) == 1 and "tile=5x5" in " ".join(commands[0])
+    assert "00:00:00.000 --> 00:00:10.000\nsprite_000.jpg#xywh=0,0,160,90" \
+        in text
+    assert "sprite_000.jpg#xywh=160,90,160,90" in text
+    assert "00:04:10.000 --> 00:04:15.000\nsprite_001.jpg#xywh=0,0,160,90" \
+        in text
+
+
+class FakeQueue:
+    """Queue stub recording enqueued jobs."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, func, *args, **kwargs):
+        """Record a job."""
+        self.jobs.append((func, args, kwargs))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("duration, timeout", [(5400.0, 600 + 21600),
+                                               (0.0, 14400)])
+def test_enqueue_transcode_only_enqueues(monkeypatch, settings, duration,
+                                         timeout):
+    """Test for a timeout from the stored duration without reading files."""
+    settings.VIDEO_TIMEOUT_BASE, settings.VIDEO_TIMEOUT_FACTOR = 600, 4
+    settings.VIDEO_TIMEOUT_DEFAULT = 14400
+    video = make_video(title="Film", duration=duration)
+    Video.objects.filter(pk=video.pk).update(
+        video_file="videos/originals/film.mp4")
+    queues: dict[str, FakeQueue] = {}
+    monkeypatch.setattr(tasks, "probe_source", pytest.fail)
+    monkeypatch.setattr(tasks, "file_sha256", pytest.fail)
+    monkeypatch.setattr(tasks.django_rq, "get_queue",
+                        lambda name: queues.setdefault(name, FakeQueue()))
+    tasks.enqueue_transcode(video.pk)
+    assert list(queues) == ["transcode"]
+    assert queues["transcode"].jobs == [
+        (tasks.process_video, (video.pk,), {"job_timeout": timeout})]
+
+
+def test_thumbnail_seek_stays_inside_short_sources(commands, tmp_path):
+    """Test for clamping the thumbnail seek to the source duration."""
+    assert tasks.make_thumbnail(tmp_path / "src.mp4", tmp_path, 3.0) is None
+    assert commands[0][commands[0].index("-ss") + 1] == "1.500"
+    tasks.make_thumbnail(tmp_path / "src.mp4", tmp_path, 60.0)
+    assert commands[1][commands[1].index("-ss") + 1] == "5.000"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None,
+                    reason="ffmpeg is not installed")
+def test_short_source_gets_preview_and_thumbnail(tmp_path):
+    """Test for a source shorter than 5 s still getting both assets."""
+    src = benchmark.generate_source(tmp_path, 320, 180, 2)
+    assert tasks.make_preview(src, tmp_path).stat().st_size > 0
+    assert tasks.make_thumbnail(src, tmp_path, 2.0).stat().st_size > 0
+
+
+@pytest.mark.django_db
+def test_process_video_records_only_produced_assets(tmp_path, monkeypatch):
+    """Test for a short source without thumbnail keeping it unset."""
+    video = make_video(title="Short")
+    Video.objects.filter(pk=video.pk).update(
+        video_file="videos/originals/short.mp4")
+    src = tmp_path / "videos" / "originals" / "short.mp4"
+    src.parent.mkdir(parents=True)
+    src.write_bytes(b"short source")
+    monkeypatch.setattr(tasks, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(tasks, "probe_source", lambda path: {
+        "duration": 3.0, "width": 640, "height": 360, "bitrate": 0})
+
+    def preview_only(cmd):
+        if cmd[-1].endswith(".preview.part.mp4"):
+            Path(cmd[-1]).write_bytes(b"clip")
+    monkeypatch.setattr(tasks, "_run", preview_only)
+    tasks.process_video(video.pk)
+    video.refresh_from_db()
+    assert video.duration == 3.0 and video.hls_playlist
+    assert video.preview.name == "videos/short/previews/preview.mp4"
+    assert not video.thumbnail
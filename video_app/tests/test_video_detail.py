@@ -1,10 +1,13 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from knox.models import AuthToken
 from rest_framework.test import APIClient
 
 from video_app.tests.utils.factories import make_video
+from video_app.tests.utils.queries import app_queries
 from video_progress_app.tests.utils.factories import (
     make_progress,
     make_user
@@ -86,3 +89,39 @@ def test_detail_not_found(api_client, auth_header, db):
     """Test for non-existing video detail."""
     res = api_client.get(_detail_url(999999), **auth_header)
     assert res.status_code == 404
+
+
+def test_detail_not_modified(api_client, db):
+    """Test for an unchanged detail answered with 304 and one query."""
+    user = make_user()
+    video = make_video(title="Bear", genre="Nature")
+    make_progress(user, video, last=12.5)
+    headers = _auth_headers(user)
+    first = api_client.get(_detail_url(video.id), **headers)
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get(_detail_url(video.id),
+                             HTTP_IF_NONE_MATCH=first["ETag"], **headers)
+    assert res.status_code == 304 and "Last-Modified" in first
+    assert len(app_queries(ctx.captured_queries)) <= 1
+
+
+def test_detail_modified_after_progress_update(api_client, db):
+    """Test for a changed progress invalidating the detail ETag."""
+    user = make_user()
+    video = make_video(title="Bear", genre="Nature")
+    prog = make_progress(user, video, last=12.5)
+    headers = _auth_headers(user)
+    etag = api_client.get(_detail_url(video.id), **headers)["ETag"]
+    prog.last_position = 20.0
+    prog.save()
+    res = api_client.get(_detail_url(video.id), HTTP_IF_NONE_MATCH=etag,
+                         **headers)
+    assert res.status_code == 200 and res.json()["last_position"] == 20.0
+
+
+def test_detail_exposes_sprite_map(api_client, auth_header, db):
+    """Test for the trick-play WebVTT map URL in the detail."""
+    v = make_video(title="Wolf", genre="Nature",
+                   sprites_vtt="videos/wolf/sprites/sprites.vtt")
+    body = api_client.get(_detail_url(v.id), **auth_header).json()
+    assert body["sprites_vtt"].endswith("/videos/wolf/sprites/sprites.vtt")
@@ -4,6 +4,8 @@ from datetime import timedelta
 # Third-party suppliers
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from knox.models import AuthToken
@@ -11,6 +13,8 @@ from rest_framework.test import APIClient
 
 # Local imports
 from .utils.factories import make_video
+from .utils.queries import app_queries
+from video_app.api.serializers import VideoListItemSerializer, encode_list_item
 from video_app.models import Video
 from video_progress_app.models import VideoProgress
 
@@ -78,3 +82,112 @@ def test_list_progress_fields_appear_only_for_started(api_client, db):
     items = {v["title"]: v for v in drama}
     assert [v["title"] for v in started] == ["A"]
     assert "progress_id" in items["A"] and "relative_position" in items["A"]
+
+
+def _video_queries(queries) -> list[str]:
+    """Get captured SQL statements reading the video table."""
+    return [q["sql"] for q in queries
+            if 'FROM "video_app_video"' in q["sql"]]
+
+
+def test_list_served_from_cached_catalog(api_client, db):
+    """Test for a repeated video list not querying videos again."""
+    _make_at("A", "Drama", 1)
+    _, headers = _auth_headers_for()
+    first = api_client.get(_list_url(), **headers).json()
+    with CaptureQueriesContext(connection) as ctx:
+        second = api_client.get(_list_url(), **headers).json()
+    assert second == first and not _video_queries(ctx.captured_queries)
+
+
+def test_list_catalog_invalidated_on_video_change(api_client, db):
+    """Test for new and deleted videos showing up immediately."""
+    a = _make_at("A", "Drama", 1)
+    _, headers = _auth_headers_for()
+    api_client.get(_list_url(), **headers)
+    _make_at("B", "Drama", 1)
+    a.delete()
+    payload = api_client.get(_list_url(), **headers).json()
+    titles = {v["title"] for g in payload for v in g["videos"]}
+    assert titles == {"B"}
+
+
+def test_list_progress_overlay_is_per_user(api_client, db):
+    """Test for cached catalog items carrying only the caller's progress."""
+    video = _make_at("A", "Drama", 1)
+    user, headers = _auth_headers_for("a@mail.com")
+    _, other_headers = _auth_headers_for("b@mail.com")
+    VideoProgress.objects.create(user=user, video=video,
+                                 last_position=5.0, relative_position=50.0)
+    mine = api_client.get(_list_url(), **headers).json()
+    theirs = api_client.get(_list_url(), **other_headers).json()
+    assert _section(mine, "Started videos")["videos"][0][
+        "relative_position"] == 50.0
+    assert _section(theirs, "Started videos") is None
+    assert "progress_id" not in _section(theirs, "Drama")["videos"][0]
+
+
+def test_list_uncached_matches_cached(api_client, db, settings):
+    """Test for the uncached list returning the same payload."""
+    video = _make_at("A", "Drama", 1)
+    _make_at("B", "Sci-Fi", 200)
+    user, headers = _auth_headers_for()
+    VideoProgress.objects.create(user=user, video=video,
+                                 last_position=5.0, relative_position=50.0)
+    cached = api_client.get(_list_url(), **headers).json()
+    settings.VIDEO_CATALOG_CACHE = False
+    assert api_client.get(_list_url(), **headers).json() == cached
+
+
+def test_list_cached_catalog_urls_follow_request_host(api_client, db,
+                                                     settings):
+    """Test for cached file URLs built from each request's own host."""
+    settings.ALLOWED_HOSTS = ["evil.example", "videoflix.example"]
+    make_video(title="A", preview="videos/a/previews/preview.mp4",
+               thumbnail="videos/a/thumbnails/a.jpg")
+    _, headers = _auth_headers_for("a@mail.com")
+    _, other_headers = _auth_headers_for("b@mail.com")
+    api_client.get(_list_url(), HTTP_HOST="evil.example", **headers)
+    payload = api_client.get(_list_url(), HTTP_HOST="videoflix.example",
+                             secure=True, **other_headers).json()
+    item = payload[0]["videos"][0]
+    assert item["preview"] == (
+        "https://videoflix.example/media/videos/a/previews/preview.mp4")
+    assert item["thumbnail"].startswith("https://videoflix.example/")
+
+
+@pytest.mark.parametrize("progress", [None, (7, 12.5)])
+def test_fast_encoder_matches_serializer(db, rf, progress):
+    """Test for the fast list encoder matching the DRF serializer."""
+    video = make_video(title="A", preview="videos/a/previews/preview.mp4")
+    if progress:
+        video.progress_id, video.relative_position = progress
+    request = rf.get(_list_url())
+    expected = VideoListItemSerializer(video,
+                                       context={"request": request}).data
+    assert encode_list_item(video, request) == dict(expected)
+
+
+def test_list_not_modified(api_client, db):
+    """Test for an unchanged list answered with 304 without app queries."""
+    _make_at("A", "Drama", 1)
+    _, headers = _auth_headers_for()
+    etag = api_client.get(_list_url(), **headers)["ETag"]
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get(_list_url(), HTTP_IF_NONE_MATCH=etag,
+                             **headers)
+    assert res.status_code == 304 and res["ETag"] == etag
+    assert len(app_queries(ctx.captured_queries)) <= 1
+
+
+def test_list_etag_changes_with_progress_and_videos(api_client, db):
+    """Test for list ETags following user progress and catalog changes."""
+    video = _make_at("A", "Drama", 1)
+    user, headers = _auth_headers_for()
+    first = api_client.get(_list_url(), **headers)["ETag"]
+    VideoProgress.objects.create(user=user, video=video, last_position=1.0)
+    second = api_client.get(_list_url(), **headers)["ETag"]
+    _make_at("B", "Drama", 1)
+    res = api_client.get(_list_url(), HTTP_IF_NONE_MATCH=second, **headers)
+    assert len({first, second, res["ETag"]}) == 3
+    assert res.status_code == 200
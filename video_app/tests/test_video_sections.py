@@ -0,0 +1,118 @@
+# Standard libraries
+from datetime import timedelta
+
+# Third-party suppliers
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from .utils.factories import make_video
+from video_app.models import Video
+from video_progress_app.models import VideoProgress
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    """Get APIClient."""
+    return APIClient()
+
+
+@pytest.fixture
+def user_headers(db):
+    """Get a user and its auth headers."""
+    User = get_user_model()
+    u = User.objects.create_user(email="user@mail.com", password="Pwd12345!")
+    _, token = AuthToken.objects.create(user=u)
+    return u, {"HTTP_AUTHORIZATION": f"Token {token}"}
+
+
+def _make_at(title: str, genre: str, created_at):
+    """Make a video and backdate its auto-set created_at."""
+    video = make_video(title=title, genre=genre)
+    Video.objects.filter(pk=video.pk).update(created_at=created_at)
+    return video
+
+
+def _sections_url() -> str:
+    """Get video sections URL."""
+    return reverse("video_app:video-sections")
+
+
+def _page_url() -> str:
+    """Get video section page URL."""
+    return reverse("video_app:video-section-page")
+
+
+def _all_pages(api_client, headers, genre: str, limit: int) -> list[str]:
+    """Follow the cursors of a section and collect the titles."""
+    titles, cursor = [], None
+    while True:
+        params = {"genre": genre, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        body = api_client.get(_page_url(), params, **headers).json()
+        titles += [v["title"] for v in body["videos"]]
+        cursor = body["next"]
+        if not cursor:
+            return titles
+
+
+def test_sections_unauthorized(api_client):
+    """Test for video sections with unauthorized user."""
+    assert api_client.get(_sections_url()).status_code == 401
+
+
+def test_sections_with_counts(api_client, user_headers):
+    """Test for section names with video counts."""
+    user, headers = user_headers
+    old = timezone.now() - timedelta(days=200)
+    v = make_video(title="A", genre="Drama")
+    _make_at("B", "Drama", old)
+    _make_at("C", "Sci-Fi", old)
+    VideoProgress.objects.create(user=user, video=v, last_position=1.0)
+    res = api_client.get(_sections_url(), **headers)
+    assert res.status_code == 200
+    assert res.json() == [
+        {"genre": "New on Videoflix", "count": 1},
+        {"genre": "Started videos", "count": 1},
+        {"genre": "Drama", "count": 2},
+        {"genre": "Sci-Fi", "count": 1},
+    ]
+
+
+def test_section_pages_follow_cursor(api_client, user_headers):
+    """Test for paging a genre newest first without gaps or repeats."""
+    _, headers = user_headers
+    now = timezone.now()
+    for i in range(5):
+        _make_at(f"T{i}", "Drama", now - timedelta(days=i // 2))
+    make_video(title="Other", genre="Sci-Fi")
+    titles = _all_pages(api_client, headers, "Drama", limit=2)
+    assert sorted(titles) == [f"T{i}" for i in range(5)]
+    assert len(titles) == 5 and titles[-1] == "T4"
+
+
+def test_section_page_started_videos(api_client, user_headers):
+    """Test for the started section carrying progress fields."""
+    user, headers = user_headers
+    v = make_video(title="A", genre="Drama")
+    make_video(title="B", genre="Drama")
+    VideoProgress.objects.create(user=user, video=v, last_position=1.0,
+                                 relative_position=5.0)
+    body = api_client.get(_page_url(), {"genre": "Started videos"},
+                          **headers).json()
+    assert [i["title"] for i in body["videos"]] == ["A"]
+    assert body["videos"][0]["relative_position"] == 5.0
+    assert body["next"] is None
+
+
+@pytest.mark.parametrize("params", [{}, {"genre": "Drama", "cursor": "x"}])
+def test_section_page_bad_request(api_client, user_headers, params):
+    """Test for section pages with missing genre or invalid cursor."""
+    _, headers = user_headers
+    assert api_client.get(_page_url(), params,
+                          **headers).status_code == 400
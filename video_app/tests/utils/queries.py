@@ -0,0 +1,7 @@
+AUTH_TABLES = ("knox_authtoken", "auth_app_user")
+
+
+def app_queries(queries) -> list[str]:
+    """Get captured SQL statements not issued by authentication."""
+    return [q["sql"] for q in queries
+            if not any(t in q["sql"] for t in AUTH_TABLES)]
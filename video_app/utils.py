@@ -1,22 +1,49 @@
 # Standard libraries
+import base64
+import hashlib
 from collections import defaultdict
-from datetime import timedelta
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable, Sequence
 
 # Third-party suppliers
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.db.models import OuterRef, QuerySet, Subquery
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control
+)
+from django.utils.http import http_date, quote_etag
 
 # Local imports
-from video_app.api.serializers import VideoListItemSerializer
+from core.metrics import count_cache
+from core.utils import (
+    aget_cache_version,
+    bump_cache_version,
+    get_cache_version
+)
+from video_app.api.serializers import encode_list_item
+from video_app.models import Video
+from video_progress_app.buffer import (
+    buffered_progress,
+    merge_buffered_progress
+)
 from video_progress_app.models import VideoProgress
+from video_progress_app.utils import aprogress_version, progress_version
 
 
 MEDIA_ROOT = Path(getattr(settings, "MEDIA_ROOT", "media"))
 MEDIA_URL = getattr(settings, "MEDIA_URL", "/media/")
 HOST = getattr(settings, "BACKEND_HOST", "http://127.0.0.1:8000")
+CATALOG_VERSION_KEY = "video_catalog:version"
+LIST_FILE_FIELDS = ("preview", "thumbnail")
+NEW_SECTION = "New on Videoflix"
+STARTED_SECTION = "Started videos"
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 def base_media_url() -> str:
@@ -36,18 +63,32 @@ def ensure_dirs(paths: Iterable[Path]) -> None:
         p.mkdir(parents=True, exist_ok=True)
 
 
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def absolute_url(rel: str) -> str:
     """Map 'videos/foo/bar' to absolute media url."""
     return f"{base_media_url().rstrip('/')}/{rel.lstrip('/')}"
 
 
-def quality_payload(name: str) -> list[dict]:
-    """Return quality levels payload for API."""
+def rung_label(res: str) -> str:
+    """Map a rung resolution like '1280x720' to the label '720p'."""
+    return f"{res.split('x')[-1]}p"
+
+
+def quality_payload(name: str, ladder: Sequence[tuple]) -> list[dict]:
+    """Return quality levels payload for the produced ladder rungs."""
     base = f"videos/{name}/hls"
-    labels = ["1080p", "720p", "360p", "144p"]
     return [
-        {"label": labels[i], "source": absolute_url(f"{base}/v{i}/index.m3u8")}
-        for i in range(4)
+        {"label": rung_label(res),
+         "source": absolute_url(f"{base}/{folder}/index.m3u8")}
+        for folder, res, *_ in ladder
     ]
 
 
@@ -87,29 +128,299 @@ def group_by_genre(videos: Sequence) -> dict[str, list]:
     return grouped
 
 
-def serialize_items(items, request):
-    """Serialize list items with the list serializer."""
-    return VideoListItemSerializer(
-        items, many=True,
-        context={"request": request}).data
+def serialize_map(videos: Sequence, request) -> dict[int, dict]:
+    """Serialize every video once and map the items by video id."""
+    return {v.id: encode_list_item(v, request) for v in videos}
 
 
-def append_section(payload: list, title: str, items: Sequence, request) -> None:
-    """Append a section if it has items."""
+def add_section(payload: list, title: str, items: list) -> None:
+    """Append a section of serialized items if it has any."""
     if items:
-        payload.append(
-            {"genre": title, "videos": serialize_items(items, request)})
+        payload.append({"genre": title, "videos": items})
 
 
 def build_list_payload(videos: Sequence, request) -> list[dict]:
     """Build list payload (new, started, genres)."""
     payload: list[dict] = []
+    items = serialize_map(videos, request)
     cutoff = new_cutoff()
-    new_items = [v for v in videos if v.created_at >= cutoff]
-    started = [v for v in videos if getattr(
-        v, "progress_id", None) is not None]
-    append_section(payload, "New on Videoflix", new_items, request)
-    append_section(payload, "Started videos", started, request)
-    for genre, items in sorted(group_by_genre(videos).items()):
-        append_section(payload, genre, items, request)
+    new_items = [items[v.id] for v in videos if v.created_at >= cutoff]
+    started = [items[v.id] for v in videos
+               if getattr(v, "progress_id", None) is not None]
+    add_section(payload, NEW_SECTION, new_items)
+    add_section(payload, STARTED_SECTION, started)
+    for genre, group in sorted(group_by_genre(videos).items()):
+        add_section(payload, genre, [items[v.id] for v in group])
+    return payload
+
+
+def catalog_cache_enabled() -> bool:
+    """Check whether the list view serves the cached catalog."""
+    return bool(getattr(settings, "VIDEO_CATALOG_CACHE", True))
+
+
+def catalog_version() -> int:
+    """Return the current catalog version, starting one if missing."""
+    return get_cache_version(CATALOG_VERSION_KEY)
+
+
+async def acatalog_version() -> int:
+    """Async variant of catalog_version for async views."""
+    return await aget_cache_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> None:
+    """Invalidate cached catalogs by moving to a new version."""
+    bump_cache_version(CATALOG_VERSION_KEY)
+
+
+def build_catalog(videos: Sequence) -> dict:
+    """Build the user- and host-independent catalog of list items.
+
+    File URLs stay relative; they are made absolute per request.
+    """
+    cutoff = new_cutoff()
+    return {
+        "order": [v.id for v in videos],
+        "items": serialize_map(videos, None),
+        "new": [v.id for v in videos if v.created_at >= cutoff],
+        "genres": [(genre, [v.id for v in items]) for genre, items
+                   in sorted(group_by_genre(videos).items())],
+    }
+
+
+def catalog_ttl() -> int:
+    """Return the seconds a built catalog stays cached."""
+    return int(getattr(settings, "VIDEO_CATALOG_TTL", 300))
+
+
+def catalog_videos() -> QuerySet:
+    """Return all videos in catalog order."""
+    return Video.objects.all().order_by("-created_at", "title")
+
+
+def get_catalog() -> dict:
+    """Return the catalog for the current version, building it on a miss."""
+    key = f"video_catalog:{catalog_version()}"
+    catalog = cache.get(key)
+    count_cache("catalog", catalog is not None)
+    if catalog is None:
+        catalog = build_catalog(list(catalog_videos()))
+        cache.set(key, catalog, timeout=catalog_ttl())
+    return catalog
+
+
+async def aget_catalog() -> dict:
+    """Async variant of get_catalog for async views."""
+    key = f"video_catalog:{await acatalog_version()}"
+    catalog = await cache.aget(key)
+    count_cache("catalog", catalog is not None)
+    if catalog is None:
+        videos = [video async for video in catalog_videos()]
+        catalog = build_catalog(videos)
+        await cache.aset(key, catalog, timeout=catalog_ttl())
+    return catalog
+
+
+def progress_rows(user_id: int) -> QuerySet:
+    """Return (video_id, id, relative_position) rows of a user."""
+    return VideoProgress.objects.filter(user_id=user_id).values_list(
+        "video_id", "id", "relative_position")
+
+
+def overlay_buffered(progress: dict, pending: dict) -> dict:
+    """Apply unflushed heartbeats to a user_progress mapping."""
+    for video_id, entry in pending.items():
+        if progress.get(video_id, (None,))[0] == entry["id"]:
+            progress[video_id] = (entry["id"], entry["relative_position"])
+    return progress
+
+
+def user_progress(user_id: int) -> dict[int, tuple[int, float]]:
+    """Map video ids to (progress_id, relative_position) for a user."""
+    progress = {video_id: (pk, rel)
+                for video_id, pk, rel in progress_rows(user_id)}
+    return overlay_buffered(progress, buffered_progress(user_id))
+
+
+async def auser_progress(user_id: int) -> dict[int, tuple[int, float]]:
+    """Async variant of user_progress for async views."""
+    progress = {video_id: (pk, rel)
+                async for video_id, pk, rel in progress_rows(user_id)}
+    pending = await sync_to_async(buffered_progress)(user_id)
+    return overlay_buffered(progress, pending)
+
+
+def overlay_progress(item: dict, progress: dict) -> dict:
+    """Return a list item with the user's progress fields added."""
+    if item["id"] not in progress:
+        return item
+    pk, rel = progress[item["id"]]
+    return {**item, "progress_id": pk, "relative_position": rel}
+
+
+def absolute_file_urls(item: dict, request) -> dict:
+    """Return a cached list item with its file URLs made absolute."""
+    urls = {field: request.build_absolute_uri(item[field])
+            for field in LIST_FILE_FIELDS if field in item}
+    return {**item, **urls} if urls else item
+
+
+def build_catalog_payload(catalog: dict, progress: dict,
+                          request) -> list[dict]:
+    """Build list payload (new, started, genres) from a cached catalog."""
+    items = {pk: overlay_progress(absolute_file_urls(item, request),
+                                  progress)
+             for pk, item in catalog["items"].items()}
+    payload: list[dict] = []
+    add_section(payload, NEW_SECTION,
+                [items[pk] for pk in catalog["new"]])
+    add_section(payload, STARTED_SECTION,
+                [items[pk] for pk in catalog["order"] if pk in progress])
+    for genre, ids in catalog["genres"]:
+        add_section(payload, genre, [items[pk] for pk in ids])
     return payload
+
+
+def genre_counts() -> list[tuple[str, int]]:
+    """Return (genre, count) pairs, cached per catalog version."""
+    key = f"video_sections:{catalog_version()}"
+    counts = cache.get(key)
+    count_cache("sections", counts is not None)
+    if counts is None:
+        rows = (Video.objects.order_by("genre").values("genre")
+                .annotate(count=Count("id")))
+        counts = [(r["genre"], r["count"]) for r in rows]
+        cache.set(key, counts, timeout=catalog_ttl())
+    return counts
+
+
+def section_index(user_id: int) -> list[dict]:
+    """Return section names with their video counts for a user."""
+    sections = [
+        (NEW_SECTION, Video.objects.filter(created_at__gte=new_cutoff())
+         .count()),
+        (STARTED_SECTION, VideoProgress.objects.filter(user_id=user_id)
+         .count()),
+        *genre_counts(),
+    ]
+    return [{"genre": title, "count": count}
+            for title, count in sections if count]
+
+
+def section_queryset(title: str, user_id: int) -> QuerySet:
+    """Return the videos of a section in keyset order."""
+    if title == NEW_SECTION:
+        qs = Video.objects.filter(created_at__gte=new_cutoff())
+    elif title == STARTED_SECTION:
+        qs = Video.objects.filter(videoprogress__user_id=user_id)
+    else:
+        qs = Video.objects.filter(genre=title)
+    return qs.order_by("-created_at", "-id")
+
+
+def encode_cursor(video) -> str:
+    """Encode the (created_at, id) position after a video."""
+    raw = f"{video.created_at.isoformat()}|{video.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor; raise ValueError if it is malformed."""
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    created, pk = raw.rsplit("|", 1)
+    return datetime.fromisoformat(created), int(pk)
+
+
+def page_size(value) -> int:
+    """Return a bounded page size from a query parameter."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def section_page(qs: QuerySet, cursor: str | None, size: int,
+                 request) -> tuple[list[dict], str | None]:
+    """Return one page of serialized items and the next cursor."""
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created)
+                       | Q(created_at=created, id__lt=pk))
+    videos = list(annotate_with_progress(qs, request.user.id)[:size + 1])
+    more = len(videos) > size
+    videos = videos[:size]
+    merge_buffered_progress(videos, request.user.id, "relative_position")
+    items = [encode_list_item(v, request) for v in videos]
+    return items, encode_cursor(videos[-1]) if more else None
+
+
+def make_etag(*parts) -> str:
+    """Return a strong ETag value derived from version parts."""
+    raw = ":".join(str(p) for p in parts)
+    return quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+
+def list_etag(user_id: int) -> str:
+    """Return the list ETag from the catalog and user progress versions."""
+    return make_etag("list", catalog_version(), progress_version(user_id),
+                     user_id, new_cutoff().date())
+
+
+async def alist_etag(user_id: int) -> str:
+    """Async variant of list_etag for async views."""
+    return make_etag("list", await acatalog_version(),
+                     await aprogress_version(user_id), user_id,
+                     new_cutoff().date())
+
+
+def detail_stamps(pk: int, user_id: int) -> QuerySet:
+    """Return the video and progress update times of a video."""
+    vp = VideoProgress.objects.filter(
+        user_id=user_id,
+        video_id=OuterRef("pk"))
+    return (Video.objects.filter(pk=pk)
+            .annotate(progress_at=Subquery(vp.values("updated_at")[:1]))
+            .values_list("updated_at", "progress_at"))
+
+
+def validators_from_stamps(row, pk: int, user_id: int,
+                           version: int) -> tuple[str, int] | None:
+    """Return (ETag, Last-Modified timestamp) from detail_stamps."""
+    if row is None:
+        return None
+    stamps = [ts for ts in row if ts is not None]
+    etag = make_etag("detail", pk, user_id, version,
+                     *(ts.isoformat() for ts in stamps))
+    return etag, int(max(stamps).timestamp())
+
+
+def detail_validators(pk: int, user_id: int) -> tuple[str, int] | None:
+    """Return (ETag, Last-Modified timestamp) of a video or None."""
+    row = detail_stamps(pk, user_id).first()
+    return validators_from_stamps(row, pk, user_id,
+                                  progress_version(user_id))
+
+
+async def adetail_validators(pk: int,
+                             user_id: int) -> tuple[str, int] | None:
+    """Async variant of detail_validators for async views."""
+    row = await detail_stamps(pk, user_id).afirst()
+    return validators_from_stamps(row, pk, user_id,
+                                  await aprogress_version(user_id))
+
+
+def not_modified(request, etag: str, last_modified: int | None = None):
+    """Return a 304 response if the request validators still match."""
+    return get_conditional_response(request, etag=etag,
+                                    last_modified=last_modified)
+
+
+def set_validators(response, etag: str, last_modified: int | None = None):
+    """Add ETag/Last-Modified and force clients to revalidate."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
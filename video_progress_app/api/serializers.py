@@ -1,10 +1,14 @@
 # Third-party suppliers
+from django.utils import timezone
 from rest_framework import serializers
 
 # Local imports
 from video_app.models import Video
 from video_progress_app.models import VideoProgress
-from video_progress_app.utils import get_relative_position
+from video_progress_app.utils import get_relative_position, upsert_progress
+
+
+BATCH_MAX_ENTRIES = 200
 
 
 class VideoProgressCreateSerializer(serializers.Serializer):
@@ -20,18 +24,19 @@ class VideoProgressCreateSerializer(serializers.Serializer):
         """Check video for existence and video progress for validity."""
         if attrs["last_position"] < 0:
             raise serializers.ValidationError("Invalid last_position.")
-        if not Video.objects.filter(id=attrs["video_id"]).exists():
+        durations = list(Video.objects.filter(id=attrs["video_id"])
+                         .values_list("duration", flat=True))
+        if not durations:
             raise serializers.ValidationError({"video_id": "Video not found."})
-        return attrs
+        return {**attrs, "duration": durations[0]}
 
     def create(self, validated):
         """Create video progress."""
         user_id = self.context["request"].user.id
-        video = Video.objects.get(id=validated["video_id"])
         rel_pos = get_relative_position(
-            validated["last_position"], video.duration)
+            validated["last_position"], validated["duration"])
         obj, _ = VideoProgress.objects.update_or_create(
-            user_id=user_id, video_id=video.id,
+            user_id=user_id, video_id=validated["video_id"],
             defaults={"last_position": validated["last_position"],
                       "relative_position": rel_pos},
         )
@@ -62,18 +67,68 @@ class VideoProgressUpdateSerializer(serializers.ModelSerializer):
         last_pos = validated["last_position"]
         instance.last_position = last_pos
         instance.relative_position = get_relative_position(last_pos, dur)
-        instance.save(update_fields=["last_position", "relative_position"])
+        instance.save(update_fields=["last_position", "relative_position",
+                                     "updated_at"])
         return instance
 
 
+class VideoProgressBatchListSerializer(serializers.ListSerializer):
+    """
+    Class representing a video progress batch serializer.
+
+    Applies queued progress entries with a single upsert, keeping the
+    newest entry per video and dropping entries older than stored ones.
+    """
+
+    def latest_entries(self, validated) -> dict[int, dict]:
+        """Keep the newest entry per video (later entries win ties)."""
+        now = timezone.now()
+        latest: dict[int, dict] = {}
+        for entry in validated:
+            ts = min(entry.get("client_ts") or now, now)
+            entry = {**entry, "client_ts": ts}
+            prev = latest.get(entry["video_id"])
+            if prev is None or prev["client_ts"] <= ts:
+                latest[entry["video_id"]] = entry
+        return latest
+
+    def create(self, validated):
+        """Upsert the entries and return the applied progress rows."""
+        latest = self.latest_entries(validated)
+        durations = dict(Video.objects.filter(id__in=latest)
+                         .values_list("id", "duration"))
+        rows = [(vid, e["last_position"],
+                 get_relative_position(e["last_position"], durations[vid]),
+                 e["client_ts"])
+                for vid, e in latest.items() if vid in durations]
+        user_id = self.context["request"].user.id
+        return [{"id": pk, "user_id": user_id, "video_id": vid,
+                 "last_position": last, "relative_position": rel}
+                for pk, vid, last, rel in upsert_progress(user_id, rows)]
+
+
+class VideoProgressBatchEntrySerializer(serializers.Serializer):
+    """
+    Class representing a video progress batch entry serializer.
+
+    Validates one queued progress entry of an offline client.
+    """
+    video_id = serializers.IntegerField()
+    last_position = serializers.FloatField(min_value=0)
+    client_ts = serializers.DateTimeField(required=False)
+
+    class Meta:
+        list_serializer_class = VideoProgressBatchListSerializer
+
+
 class VideoProgressDetailSerializer(serializers.ModelSerializer):
     """
     Class representing a video progress detail serializer.
 
     Handles payload for update and deletion of a video progress.
     """
-    user_id = serializers.IntegerField(source="user.id", read_only=True)
-    video_id = serializers.IntegerField(source="video.id", read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
+    video_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = VideoProgress
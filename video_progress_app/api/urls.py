@@ -2,12 +2,18 @@
 from django.urls import path
 
 # Local imports
-from .views import VideoProgressCreateView, VideoProgressDetailView
+from .views import (
+    VideoProgressBatchView,
+    VideoProgressCreateView,
+    VideoProgressDetailView
+)
 
 app_name = "video_progress_app"
 
 urlpatterns = [
     path("", VideoProgressCreateView.as_view(), name="video-progress-create"),
+    path("batch/", VideoProgressBatchView.as_view(),
+         name="video-progress-batch"),
     path("<int:pk>/", VideoProgressDetailView.as_view(),
          name="video-progress-detail"),
 ]
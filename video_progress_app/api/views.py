@@ -1,13 +1,22 @@
 # Third-party suppliers
-from knox.auth import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Local imports
+from auth_app.authentication import CachedTokenAuthentication
+from core.profiling import timing
+from video_progress_app.buffer import (
+    buffer_enabled,
+    buffer_progress,
+    discard_buffered,
+    progress_meta
+)
 from video_progress_app.models import VideoProgress
 from .permissions import IsOwner
 from .serializers import (
+    BATCH_MAX_ENTRIES,
+    VideoProgressBatchEntrySerializer,
     VideoProgressCreateSerializer,
     VideoProgressDetailSerializer,
     VideoProgressUpdateSerializer,
@@ -20,7 +29,7 @@ class VideoProgressCreateView(APIView):
 
     Post a video progress for specific user and video.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -32,7 +41,35 @@ class VideoProgressCreateView(APIView):
                 return Response({"detail": "Not found."}, status=404)
             return Response(ser.errors, status=400)
         obj = ser.save()
-        return Response(VideoProgressDetailSerializer(obj).data, status=201)
+        discard_buffered(obj.user_id, obj.video_id)
+        with timing("serialize"):
+            data = VideoProgressDetailSerializer(obj).data
+        return Response(data, status=201)
+
+
+class VideoProgressBatchView(APIView):
+    """
+    Class representing a video progress batch view.
+
+    Upserts a list of queued progress entries in one statement.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Post a batch of video progress entries."""
+        ser = VideoProgressBatchEntrySerializer(
+            data=request.data, many=True, allow_empty=False,
+            max_length=BATCH_MAX_ENTRIES, context={"request": request})
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        applied = ser.save()
+        for entry in applied:
+            discard_buffered(entry["user_id"], entry["video_id"])
+        applied_ids = {entry["video_id"] for entry in applied}
+        skipped = sorted({e["video_id"] for e in ser.validated_data}
+                         - applied_ids)
+        return Response({"results": applied, "skipped": skipped})
 
 
 class VideoProgressDetailView(APIView):
@@ -41,7 +78,7 @@ class VideoProgressDetailView(APIView):
 
     Patches and deletes video progress.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsOwner]
 
     def _get_obj(self, pk):
@@ -52,8 +89,22 @@ class VideoProgressDetailView(APIView):
         except VideoProgress.DoesNotExist:
             return None
 
+    def _buffer_patch(self, request, pk: int):
+        """Accept a progress heartbeat into the Redis write-behind buffer."""
+        meta = progress_meta(pk)
+        if not meta:
+            return Response({"detail": "Not found."}, status=404)
+        self.check_object_permissions(request, meta)
+        ser = VideoProgressUpdateSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        entry = buffer_progress(meta, ser.validated_data["last_position"])
+        return Response(entry)
+
     def patch(self, request, pk: int):
         """Patch video progress."""
+        if buffer_enabled():
+            return self._buffer_patch(request, pk)
         obj = self._get_obj(pk)
         if not obj:
             return Response({"detail": "Not found."}, status=404)
@@ -62,7 +113,9 @@ class VideoProgressDetailView(APIView):
         if not ser.is_valid():
             return Response(ser.errors, status=400)
         ser.save()
-        return Response(VideoProgressDetailSerializer(obj).data)
+        with timing("serialize"):
+            data = VideoProgressDetailSerializer(obj).data
+        return Response(data)
 
     def delete(self, request, pk: int):
         """Delete video progress."""
@@ -70,5 +123,6 @@ class VideoProgressDetailView(APIView):
         if not obj:
             return Response({"detail": "Not found."}, status=404)
         self.check_object_permissions(request, obj)
+        discard_buffered(obj.user_id, obj.video_id)
         obj.delete()
         return Response(status=204)
@@ -3,6 +3,10 @@ from django.apps import AppConfig
 
 
 class VideoProgressAppConfig(AppConfig):
-    """Video progress app config with default settings."""
+    """Video progress app config that wires signals on startup."""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'video_progress_app'
+
+    def ready(self) -> None:
+        """Import video progress signals when Django is ready."""
+        from . import signals
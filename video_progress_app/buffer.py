@@ -0,0 +1,138 @@
+# Standard libraries
+import json
+import logging
+from datetime import timedelta
+from typing import NamedTuple, Sequence
+
+# Third-party suppliers
+import django_rq
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+# Local imports
+from core.metrics import count_cache
+from video_progress_app.models import VideoProgress
+from video_progress_app.utils import (
+    bump_progress_version,
+    get_relative_position
+)
+
+
+logger = logging.getLogger(__name__)
+
+BUFFER_PREFIX = "videoflix:progress:buffer"
+DIRTY_KEY = "videoflix:progress:dirty"
+FLUSH_SCHEDULED_KEY = "video_progress:flush_scheduled"
+META_TTL = 300
+
+
+class ProgressMeta(NamedTuple):
+    """Ownership and duration data needed to accept a heartbeat."""
+    id: int
+    user_id: int
+    video_id: int
+    duration: float
+
+
+def buffer_enabled() -> bool:
+    """Check whether progress updates are buffered in Redis."""
+    return bool(getattr(settings, "VIDEO_PROGRESS_BUFFERED", False))
+
+
+def flush_interval() -> int:
+    """Return the seconds between buffer flushes."""
+    return int(getattr(settings, "VIDEO_PROGRESS_FLUSH_SECONDS", 10))
+
+
+def buffer_key(user_id) -> str:
+    """Return the Redis hash holding a user's unflushed progress."""
+    return f"{BUFFER_PREFIX}:{int(user_id)}"
+
+
+def processing_key(user_id) -> str:
+    """Return the Redis hash holding a user's heartbeats being flushed."""
+    return f"{buffer_key(user_id)}:processing"
+
+
+def meta_key(pk: int) -> str:
+    """Return the cache key of a progress' meta data."""
+    return f"video_progress:meta:{pk}"
+
+
+def progress_meta(pk: int) -> ProgressMeta | None:
+    """Return cached meta data of a progress, loading it on a miss."""
+    meta = cache.get(meta_key(pk))
+    count_cache("progress_meta", meta is not None)
+    if meta is None:
+        row = (VideoProgress.objects.filter(pk=pk)
+               .values_list("id", "user_id", "video_id", "video__duration")
+               .first())
+        if row is None:
+            return None
+        meta = ProgressMeta(*row[:3], row[3] or 0.0)
+        cache.set(meta_key(pk), meta, timeout=META_TTL)
+    return meta
+
+
+def forget_progress_meta(pk: int) -> None:
+    """Drop cached meta data of a progress."""
+    cache.delete(meta_key(pk))
+
+
+def buffer_progress(meta: ProgressMeta, last_position: float) -> dict:
+    """Store a heartbeat in Redis (last write wins) and schedule a flush."""
+    entry = {
+        "id": meta.id, "user_id": meta.user_id, "video_id": meta.video_id,
+        "last_position": last_position,
+        "relative_position": get_relative_position(last_position,
+                                                   meta.duration),
+    }
+    conn = get_redis_connection("default")
+    pipe = conn.pipeline()
+    pipe.hset(buffer_key(meta.user_id), meta.video_id, json.dumps(entry))
+    pipe.sadd(DIRTY_KEY, meta.user_id)
+    pipe.execute()
+    bump_progress_version(meta.user_id)
+    schedule_flush()
+    return entry
+
+
+def discard_buffered(user_id: int, video_id: int) -> None:
+    """Drop an unflushed heartbeat, e.g. after a direct write or delete."""
+    if buffer_enabled():
+        pipe = get_redis_connection("default").pipeline()
+        pipe.hdel(buffer_key(user_id), video_id)
+        pipe.hdel(processing_key(user_id), video_id)
+        pipe.execute()
+
+
+def buffered_progress(user_id: int) -> dict[int, dict]:
+    """Return a user's unflushed heartbeats keyed by video id."""
+    if not buffer_enabled():
+        return {}
+    raw = get_redis_connection("default").hgetall(buffer_key(user_id))
+    return {int(k): json.loads(v) for k, v in raw.items()}
+
+
+def merge_buffered_progress(videos: Sequence, user_id: int,
+                            field: str) -> None:
+    """Overlay unflushed positions onto videos annotated with progress."""
+    pending = buffered_progress(user_id)
+    for video in videos:
+        entry = pending.get(video.id)
+        if entry and getattr(video, "progress_id", None) == entry["id"]:
+            setattr(video, field, entry[field])
+
+
+def schedule_flush() -> None:
+    """Enqueue one delayed flush per interval."""
+    interval = flush_interval()
+    if not cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=interval):
+        return
+    try:
+        django_rq.get_queue("housekeeping").enqueue_in(
+            timedelta(seconds=interval),
+            "video_progress_app.tasks.flush_progress_buffer")
+    except Exception:
+        logger.exception("Failed to schedule progress buffer flush.")
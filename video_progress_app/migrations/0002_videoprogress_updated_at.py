@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_progress_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoprogress',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
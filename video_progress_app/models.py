@@ -17,6 +17,7 @@ class VideoProgress(models.Model):
     last_position = models.FloatField(default=0.0)
     relative_position = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
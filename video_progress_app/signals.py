@@ -0,0 +1,21 @@
+# Third-party suppliers
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Local imports
+from .buffer import forget_progress_meta
+from .models import VideoProgress
+from .utils import bump_progress_version
+
+
+@receiver(post_save, sender=VideoProgress)
+@receiver(post_delete, sender=VideoProgress)
+def invalidate_progress(sender, instance: VideoProgress, **kwargs):
+    """Bump the owner's progress version whenever a progress changes."""
+    bump_progress_version(instance.user_id)
+
+
+@receiver(post_delete, sender=VideoProgress)
+def forget_meta(sender, instance: VideoProgress, **kwargs):
+    """Drop the cached heartbeat meta data of a deleted progress."""
+    forget_progress_meta(instance.pk)
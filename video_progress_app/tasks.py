@@ -0,0 +1,71 @@
+# Standard libraries
+import json
+
+# Third-party suppliers
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+# Local imports
+from video_progress_app.buffer import (
+    DIRTY_KEY,
+    buffer_key,
+    processing_key,
+    schedule_flush
+)
+from video_progress_app.models import VideoProgress
+
+
+# Move a user's buffer into its processing hash (newer entries win) and
+# return the processing hash, so no heartbeat is lost between the steps.
+CLAIM_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    redis.call('HSET', KEYS[2], entries[i], entries[i + 1])
+end
+redis.call('DEL', KEYS[1])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+
+def claim_buffered_entries(batch_size: int) -> tuple[list, list[dict]]:
+    """Claim the unflushed heartbeats of up to batch_size users.
+
+    Claimed entries stay in the users' processing hashes until the
+    flush has written them.
+    """
+    conn = get_redis_connection("default")
+    claim = conn.register_script(CLAIM_SCRIPT)
+    user_ids = list(conn.spop(DIRTY_KEY, batch_size) or [])
+    entries: list[dict] = []
+    for user_id in user_ids:
+        raw = claim(keys=[buffer_key(user_id), processing_key(user_id)])
+        entries += [json.loads(v) for v in raw[1::2]]
+    return user_ids, entries
+
+
+def flush_progress_buffer(batch_size: int = 500) -> int:
+    """Write buffered heartbeats to VideoProgress and return the count.
+
+    On a failed write the users are marked dirty again, so the next
+    flush retries their processing hashes.
+    """
+    user_ids, entries = claim_buffered_entries(batch_size)
+    conn = get_redis_connection("default")
+    now = timezone.now()
+    objs = [VideoProgress(id=e["id"], last_position=e["last_position"],
+                          relative_position=e["relative_position"],
+                          updated_at=now) for e in entries]
+    try:
+        VideoProgress.objects.bulk_update(
+            objs, ["last_position", "relative_position", "updated_at"],
+            batch_size=batch_size)
+    except Exception:
+        if user_ids:
+            conn.sadd(DIRTY_KEY, *user_ids)
+        schedule_flush()
+        raise
+    if user_ids:
+        conn.delete(*[processing_key(u) for u in user_ids])
+    if conn.scard(DIRTY_KEY):
+        schedule_flush()
+    return len(objs)
@@ -0,0 +1,70 @@
+# Third-party suppliers
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from .utils.factories import make_progress, make_user, make_video
+
+
+# Budgets include the token and user lookups of a cold token cache
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def api_client(db) -> APIClient:
+    """Get APIClient of a user with a knox token."""
+    user = make_user()
+    _, token = AuthToken.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    client.user = user
+    return client
+
+
+def _detail_url(pk: int) -> str:
+    """Get video progress detail URL."""
+    return reverse("video_progress_app:video-progress-detail",
+                   kwargs={"pk": pk})
+
+
+def test_create_budget(api_client, query_budget):
+    """Test for the query count of creating a progress."""
+    video = make_video(duration=100.0)
+    url = reverse("video_progress_app:video-progress-create")
+    with query_budget(AUTH_QUERIES + 7):
+        res = api_client.post(url, {"video_id": video.id,
+                                    "last_position": 10.0})
+    assert res.status_code == 201
+
+
+def test_patch_budget(api_client, query_budget):
+    """Test for the query count of patching a progress."""
+    progress = make_progress(api_client.user, make_video(duration=100.0))
+    with query_budget(AUTH_QUERIES + 2):
+        res = api_client.patch(_detail_url(progress.pk),
+                               {"last_position": 50.0})
+    assert res.status_code == 200
+
+
+def test_delete_budget(api_client, query_budget):
+    """Test for the query count of deleting a progress."""
+    progress = make_progress(api_client.user, make_video(duration=100.0))
+    with query_budget(AUTH_QUERIES + 2):
+        res = api_client.delete(_detail_url(progress.pk))
+    assert res.status_code == 204
+
+
+@pytest.mark.parametrize("count", [1, 20])
+def test_batch_budget(api_client, query_budget, count):
+    """Test for a constant query count of a batch upsert."""
+    now = timezone.now().isoformat()
+    entries = [{"video_id": make_video(title=f"V{i}", duration=100.0).id,
+                "last_position": 10.0, "client_ts": now}
+               for i in range(count)]
+    url = reverse("video_progress_app:video-progress-batch")
+    with query_budget(AUTH_QUERIES + 2):
+        res = api_client.post(url, entries, format="json")
+    assert res.status_code == 200
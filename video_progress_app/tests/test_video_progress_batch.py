@@ -0,0 +1,109 @@
+# Standard libraries
+from datetime import timedelta
+
+# Third-party suppliers
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from video_progress_app.models import VideoProgress
+from .utils.factories import make_user, make_video, make_progress
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    """Get APIClient."""
+    return APIClient()
+
+
+def _auth_headers(user):
+    """Get auth headers for specific user."""
+    _, token = AuthToken.objects.create(user=user)
+    return {"HTTP_AUTHORIZATION": f"Token {token}"}
+
+
+def _url_batch():
+    """Get video progress batch URL."""
+    return reverse("video_progress_app:video-progress-batch")
+
+
+def _post(api_client, user, entries):
+    """Post a batch of progress entries."""
+    return api_client.post(_url_batch(), entries, format="json",
+                           **_auth_headers(user))
+
+
+def _video(title: str, duration: float = 100.0):
+    """Make a video with a known duration."""
+    return make_video(title=title, duration=duration)
+
+
+def test_batch_creates_and_updates(api_client):
+    """Test for inserting new and updating existing progress."""
+    user, a, b = make_user(), _video("A"), _video("B", 200.0)
+    make_progress(user, a, last=5.0)
+    res = _post(api_client, user, [
+        {"video_id": a.id, "last_position": 50.0},
+        {"video_id": b.id, "last_position": 50.0},
+    ])
+    assert res.status_code == 200
+    assert len(res.json()["results"]) == 2
+    rel = dict(VideoProgress.objects.filter(user=user)
+               .values_list("video_id", "relative_position"))
+    assert rel == {a.id: 50.0, b.id: 25.0}
+
+
+def test_batch_drops_stale_entries(api_client):
+    """Test for keeping stored progress newer than a queued entry."""
+    user, video = make_user(), _video("A")
+    vp = make_progress(user, video, last=80.0)
+    old = (timezone.now() - timedelta(hours=1)).isoformat()
+    res = _post(api_client, user, [
+        {"video_id": video.id, "last_position": 10.0, "client_ts": old}])
+    assert res.json() == {"results": [], "skipped": [video.id]}
+    vp.refresh_from_db()
+    assert vp.last_position == 80.0
+
+
+def test_batch_keeps_newest_entry_per_video(api_client):
+    """Test for applying only the newest of duplicate entries."""
+    user, video = make_user(), _video("A")
+    now = timezone.now()
+    res = _post(api_client, user, [
+        {"video_id": video.id, "last_position": 30.0,
+         "client_ts": (now - timedelta(seconds=5)).isoformat()},
+        {"video_id": video.id, "last_position": 20.0,
+         "client_ts": (now - timedelta(seconds=9)).isoformat()},
+    ])
+    assert [r["last_position"] for r in res.json()["results"]] == [30.0]
+
+
+def test_batch_skips_unknown_videos(api_client):
+    """Test for skipping entries of unknown videos."""
+    user = make_user()
+    res = _post(api_client, user, [
+        {"video_id": 999999, "last_position": 1.0}])
+    assert res.status_code == 200
+    assert res.json()["skipped"] == [999999]
+
+
+@pytest.mark.parametrize("payload", [
+    [], {"video_id": 1, "last_position": 1.0},
+    [{"video_id": 1, "last_position": -1.0}],
+])
+def test_batch_invalid_payload(api_client, payload):
+    """Test for rejecting empty, non-list or invalid batches."""
+    res = _post(api_client, make_user(), payload)
+    assert res.status_code == 400
+
+
+def test_batch_requires_auth(api_client):
+    """Test for rejecting anonymous batches."""
+    res = api_client.post(_url_batch(), [], format="json")
+    assert res.status_code == 401
@@ -0,0 +1,146 @@
+# Third-party suppliers
+import pytest
+from django.db import DatabaseError
+from django.urls import reverse
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+# Local imports
+from video_progress_app import tasks
+from video_progress_app.buffer import buffered_progress
+from video_progress_app.models import VideoProgress
+from video_progress_app.tasks import flush_progress_buffer
+from .utils.factories import make_user, make_video, make_progress
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    """Get APIClient."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def buffered(settings):
+    """Enable the write-behind progress buffer."""
+    settings.VIDEO_PROGRESS_BUFFERED = True
+
+
+def _auth_headers(user):
+    """Get auth headers for specific user."""
+    _, token = AuthToken.objects.create(user=user)
+    return {"HTTP_AUTHORIZATION": f"Token {token}"}
+
+
+def _url_detail(pid: int):
+    """Get video progress detail URL."""
+    return reverse("video_progress_app:video-progress-detail",
+                   kwargs={"pk": pid})
+
+
+def _patch(api_client, user, progress, last: float):
+    """Patch a video progress."""
+    return api_client.patch(_url_detail(progress.id),
+                            {"last_position": last}, format="json",
+                            **_auth_headers(user))
+
+
+def _setup(last: float = 10.0):
+    """Create a user, a 100s video and a progress."""
+    user, video = make_user(), make_video()
+    video.duration = 100.0
+    video.save(update_fields=["duration"])
+    return user, video, make_progress(user, video, last=last, rel=10.0)
+
+
+def test_buffered_patch_skips_database(api_client):
+    """Test for a buffered heartbeat leaving the row untouched."""
+    user, video, vp = _setup()
+    res = _patch(api_client, user, vp, 42.0)
+    assert res.status_code == 200
+    assert res.json()["relative_position"] == 42.0
+    vp.refresh_from_db()
+    assert vp.last_position == 10.0
+    assert buffered_progress(user.id)[video.id]["last_position"] == 42.0
+
+
+def test_buffered_patch_non_owner_forbidden(api_client):
+    """Test for rejecting heartbeats of other users."""
+    _, _, vp = _setup()
+    res = _patch(api_client, make_user("other@mail.com"), vp, 42.0)
+    assert res.status_code == 403
+
+
+def test_buffered_patch_not_found(api_client):
+    """Test for 404 on an unknown progress."""
+    res = api_client.patch(_url_detail(999999), {"last_position": 1.0},
+                           format="json", **_auth_headers(make_user()))
+    assert res.status_code == 404
+
+
+def test_reads_merge_buffered_progress(api_client):
+    """Test for list and detail showing unflushed positions."""
+    user, video, vp = _setup()
+    _patch(api_client, user, vp, 55.0)
+    headers = _auth_headers(user)
+    detail = api_client.get(
+        reverse("video_app:video-detail", kwargs={"pk": video.id}),
+        **headers)
+    assert detail.json()["last_position"] == 55.0
+    body = api_client.get(reverse("video_app:video-list"), **headers).json()
+    items = [v for s in body for v in s["videos"] if v["id"] == video.id]
+    assert items and all(v["relative_position"] == 55.0 for v in items)
+
+
+def test_flush_writes_latest_position(api_client):
+    """Test for the flush job persisting the last heartbeat only."""
+    user, video, vp = _setup()
+    _patch(api_client, user, vp, 20.0)
+    _patch(api_client, user, vp, 30.0)
+    assert flush_progress_buffer() == 1
+    vp.refresh_from_db()
+    assert (vp.last_position, vp.relative_position) == (30.0, 30.0)
+    assert buffered_progress(user.id) == {}
+
+
+def test_failed_flush_keeps_entries_for_retry(api_client, monkeypatch):
+    """Test for a failed DB write leaving heartbeats to the next flush."""
+    user, video, vp = _setup()
+    _patch(api_client, user, vp, 20.0)
+
+    def fail(*args, **kwargs):
+        raise DatabaseError("connection lost")
+    monkeypatch.setattr(VideoProgress.objects, "bulk_update", fail)
+    monkeypatch.setattr(tasks, "schedule_flush", lambda: None)
+    with pytest.raises(DatabaseError):
+        flush_progress_buffer()
+    monkeypatch.undo()
+    assert flush_progress_buffer() == 1
+    vp.refresh_from_db()
+    assert vp.last_position == 20.0
+    assert flush_progress_buffer() == 0
+
+
+def test_newer_heartbeat_wins_over_claimed(api_client, monkeypatch):
+    """Test for a newer heartbeat replacing a claimed, unwritten one."""
+    user, video, vp = _setup()
+    _patch(api_client, user, vp, 20.0)
+    monkeypatch.setattr(tasks, "schedule_flush", lambda: None)
+    tasks.claim_buffered_entries(500)
+    tasks.get_redis_connection("default").sadd(tasks.DIRTY_KEY, user.id)
+    _patch(api_client, user, vp, 30.0)
+    assert flush_progress_buffer() == 1
+    vp.refresh_from_db()
+    assert vp.last_position == 30.0
+
+
+def test_delete_discards_buffered_progress(api_client):
+    """Test for deleting a progress dropping its pending heartbeat."""
+    user, video, vp = _setup()
+    _patch(api_client, user, vp, 20.0)
+    api_client.delete(_url_detail(vp.id), **_auth_headers(user))
+    assert buffered_progress(user.id) == {}
+    flush_progress_buffer()
+    assert not VideoProgress.objects.filter(pk=vp.id).exists()
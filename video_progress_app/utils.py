@@ -1,5 +1,15 @@
+# Third-party suppliers
+from django.db import connection
+from django.utils import timezone
+
 # Local imports
+from core.utils import (
+    aget_cache_version,
+    bump_cache_version,
+    get_cache_version
+)
 from video_app.models import Video
+from video_progress_app.models import VideoProgress
 
 
 def get_video_instance(serializer):
@@ -26,3 +36,61 @@ def get_relative_position(last: float, dur: float) -> float:
     if not dur or dur <= 0:
         return 0.0
     return round(last / dur * 100.0, 2)
+
+
+def progress_version_key(user_id: int) -> str:
+    """Return the cache key of a user's progress version."""
+    return f"video_progress:version:{user_id}"
+
+
+def progress_version(user_id: int) -> int:
+    """Return the version of a user's video progress."""
+    return get_cache_version(progress_version_key(user_id))
+
+
+async def aprogress_version(user_id: int) -> int:
+    """Async variant of progress_version for async views."""
+    return await aget_cache_version(progress_version_key(user_id))
+
+
+def bump_progress_version(user_id: int) -> None:
+    """Invalidate validators derived from a user's video progress."""
+    bump_cache_version(progress_version_key(user_id))
+
+
+UPSERT_SQL = """
+    INSERT INTO {table} (user_id, video_id, last_position,
+                         relative_position, created_at, updated_at)
+    VALUES {rows}
+    ON CONFLICT (user_id, video_id) DO UPDATE SET
+        last_position = EXCLUDED.last_position,
+        relative_position = EXCLUDED.relative_position,
+        updated_at = EXCLUDED.updated_at
+    WHERE {table}.updated_at < EXCLUDED.updated_at
+    RETURNING id, video_id, last_position, relative_position
+"""
+
+
+def upsert_progress(user_id: int, rows: list[tuple]) -> list[tuple]:
+    """
+    Insert or update (video_id, last, rel, ts) rows in one statement.
+
+    Rows older than the stored progress are dropped by the conflict
+    clause; the applied rows are returned.
+    """
+    if not rows:
+        return []
+    adapt = connection.ops.adapt_datetimefield_value
+    now = adapt(timezone.now())
+    params: list = []
+    for video_id, last, rel, ts in rows:
+        params += [user_id, video_id, last, rel, now, adapt(ts)]
+    sql = UPSERT_SQL.format(
+        table=connection.ops.quote_name(VideoProgress._meta.db_table),
+        rows=", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows)))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        applied = cursor.fetchall()
+    if applied:
+        bump_progress_version(user_id)
+    return applied